@@ -1,10 +1,8 @@
 import argparse
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import matplotlib
-from src.web_scraping.scrapers import ZillowScraper
-matplotlib.use('Agg')  # Set non-interactive backend
 sys.path.append(str(Path(__file__).parent))
 sys.path.append(str(Path(__file__).parent / "src"))
 # For imports from config.py (assuming config.py is in src/)
@@ -19,16 +17,11 @@ from src.config import (
     PROPERTY_DATA_FILE,
     COMPARABLE_SALES_FILE
 )
-from src.data_processing.data_processor import DataProcessor
-from src.valuation_calculator import ValuationCalculator
-from src.report_generation.report_generator import ReportGenerator
-from src.web_scraping.scraper_manager import property_scraper
-from src.report_generation.docx_generation import generate_report
-# Configure logging
+# Configure logging once for the whole application; modules only call getLogger
 logging.basicConfig(
     level=LOG_LEVEL,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    filename=LOG_FILE
+    handlers=[logging.FileHandler(LOG_FILE), logging.StreamHandler()]
 )
 logger = logging.getLogger(__name__)
 
@@ -102,12 +95,14 @@ def calculate_valuations(args, property_details, calculator):
     try:
         if args.all_methods:
             logger.info("Running all valuation methods...")
-            results = []
-            for method in VALUATION_METHODS:
+            
+            def run_method(method):
                 logger.info(f"Calculating {method} valuation...")
-                result = calculator.calculate_valuation(property_details, method)
-                if result:
-                    results.append(result)
+                return calculator.calculate_valuation(property_details, method)
+            
+            # The methods are independent, so evaluate them concurrently
+            with ThreadPoolExecutor(max_workers=len(VALUATION_METHODS)) as executor:
+                results = [r for r in executor.map(run_method, VALUATION_METHODS) if r]
             return sorted(results, key=lambda x: x.confidence, reverse=True)
         else:
             logger.info(f"Calculating valuation using {args.method} method...")
@@ -117,18 +112,15 @@ def calculate_valuations(args, property_details, calculator):
         raise
 
 def main():
-    
-    zillow_url = input("Enter Zillow property URL: ")
-    try:
-        generate_report(zillow_url)
-        print("Report generated successfully!")
-    except Exception as e:
-        print(f"Error: {str(e)}")
-    
     try:
         args = parse_arguments()
         logger.info("Initializing valuation system components")
         
+        # Heavy imports (pandas, matplotlib, docx) are deferred until the arguments are valid
+        from src.data_processing.data_processor import DataProcessor
+        from src.valuation_calculator import ValuationCalculator
+        from src.report_generation.report_generator import ReportGenerator
+        
         # Initialize system components
         data_processor = DataProcessor()
         valuation_calculator = ValuationCalculator(data_processor)
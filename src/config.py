@@ -19,33 +19,99 @@ DIR_CONFIG = {
     'REPORTS': REPORTS_DIR
 }
 
-# Create all required directories
-for dir_path in DIR_CONFIG.values():
-    dir_path.mkdir(parents=True, exist_ok=True)
+# Directories known to exist in this process; mkdir is attempted once per path
+_created_dirs = set()
+
+def ensure_dir(path: Path) -> Path:
+    """Create a directory (and missing parents) at most once per process"""
+    if path in _created_dirs:
+        return path
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        ensure_dir(path.parent)
+        os.makedirs(path, exist_ok=True)
+    _created_dirs.add(path)
+    return path
+
+# Only the log directory is needed at import time; the data directory is created
+# when seeding, templates by ReportGenerator, and outputs via ensure_output_dir()
+ensure_dir(LOGS_DIR)
+
+def ensure_output_dir() -> Path:
+    """Create the output directories on first use and return OUTPUT_DIR"""
+    ensure_dir(REPORTS_DIR)
+    return OUTPUT_DIR
 
 # File paths
 PROPERTY_DATA_FILE = DATA_DIR / "property_data.csv"
 COMPARABLE_SALES_FILE = DATA_DIR / "comparable_sales.csv"
 LOG_FILE = LOGS_DIR / "valuation_system.log"
-REPORT_TEMPLATE = TEMPLATES_DIR / "report_template.html"
 COMPANY_LOGO = TEMPLATES_DIR / "company_logo.png"
+# Scraped pages and their ETag/Last-Modified validators, for conditional re-fetches
+SCRAPE_CACHE_DIR = DATA_DIR / "scrape_cache"
 
-# Initialize default data files if missing
-if not PROPERTY_DATA_FILE.exists():
-    with open(PROPERTY_DATA_FILE, 'w') as f:
-        f.write("""id,address,city,state,zip_code,property_type,bedrooms,bathrooms,sqft,lot_size,year_built,price
+# Initialize default data files if missing; exclusive-create mode does the
+# existence check as part of the open, so an existing file costs one syscall
+def _seed_data_file(path: Path, content: str):
+    """Write a default data file unless one already exists"""
+    try:
+        with open(path, 'x') as f:
+            f.write(content)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        ensure_dir(DATA_DIR)
+        _seed_data_file(path, content)
+
+_seed_data_file(PROPERTY_DATA_FILE, """id,address,city,state,zip_code,property_type,bedrooms,bathrooms,sqft,lot_size,year_built,price
 1,123 Main St,Anytown,CA,12345,Single Family,3,2.5,1800,0.25,1995,750000
 2,456 Oak Ave,Somewhere,CA,54321,Condo,2,2,1200,0.1,2010,650000""")
 
-if not COMPARABLE_SALES_FILE.exists():
-    with open(COMPARABLE_SALES_FILE, 'w') as f:
-        f.write("""id,address,property_type,bedrooms,bathrooms,sqft,lot_size,year_built,sale_price,sale_date,distance_miles
+_seed_data_file(COMPARABLE_SALES_FILE, """id,address,property_type,bedrooms,bathrooms,sqft,lot_size,year_built,sale_price,sale_date,distance_miles
 101,124 Main St,Single Family,3,2,1750,0.23,1998,725000,2023-01-15,0.1
 102,125 Main St,Single Family,4,2.5,2000,0.3,1997,800000,2023-02-20,0.2""")
 
+# CSV schemas: columns to load and their dtypes (integer counts are nullable)
+PROPERTY_USECOLS = (
+    'id', 'address', 'city', 'state', 'zip_code', 'property_type',
+    'bedrooms', 'bathrooms', 'sqft', 'lot_size', 'year_built',
+    'annual_rent', 'price'
+)
+PROPERTY_DTYPES = {
+    'id': 'str',
+    'zip_code': 'str',
+    'property_type': 'category',
+    'bedrooms': 'Int32',
+    'bathrooms': 'float32',
+    'sqft': 'Int32',
+    'lot_size': 'float32',
+    'year_built': 'Int32'
+}
+COMPARABLE_USECOLS = (
+    'id', 'address', 'property_type', 'bedrooms', 'bathrooms', 'sqft',
+    'lot_size', 'year_built', 'sale_price', 'sale_date', 'distance_miles'
+)
+COMPARABLE_DTYPES = {
+    'id': 'str',
+    'sale_date': 'str',
+    'property_type': 'category',
+    'bedrooms': 'Int32',
+    'bathrooms': 'float32',
+    'sqft': 'Int32',
+    'lot_size': 'float32',
+    'year_built': 'Int32'
+}
+CSV_CHUNK_SIZE = 50_000  # rows per chunk when scanning for a single property
+MATCH_BLOCK_SIZE = 4096  # rows per block when scanning for comparable matches
+
 # Report configuration
 REPORT_TEMPLATE = TEMPLATES_DIR / 'report_template.docx'  
 COMPANY_NAME = "Real Estate Valuation Inc."
+# Charts are embedded as PNG; python-docx cannot embed SVG images
+CHART_DPI = 100
 
 # Valuation methods
 VALUATION_METHODS = [
@@ -67,6 +133,11 @@ SCRAPING_SETTINGS = {
     ]
 }
 
+PROXY_SETTINGS = {
+    'enabled': True,
+    'refresh_interval': 3600  # seconds between proxy list refreshes
+}
+
 # Model configuration
 MODEL_CONFIG = {
     'default_path': BASE_DIR / 'models' / 'trained_model.pkl',
@@ -103,44 +174,56 @@ REPORT_CONFIG = {
 
 class Config:
     """Configuration class for easy access to settings."""
-    def __init__(self):
-        self.BASE_DIR = BASE_DIR
-        self.DATA_DIR = DATA_DIR
-        self.LOGS_DIR = LOGS_DIR
-        self.REPORTS_DIR = REPORTS_DIR
-        self.TEMPLATES_DIR = TEMPLATES_DIR
-        self.PROPERTY_DATA_FILE = PROPERTY_DATA_FILE
-        self.COMPARABLE_SALES_FILE = COMPARABLE_SALES_FILE
-        self.LOG_FILE = LOG_FILE
-        self.REPORT_TEMPLATE = REPORT_TEMPLATE
-        self.COMPANY_NAME = COMPANY_NAME
-        self.COMPANY_LOGO = COMPANY_LOGO
-        self.DEFAULT_METHOD = DEFAULT_METHOD
-        self.VALUATION_METHODS = VALUATION_METHODS
-        self.LOG_LEVEL = LOG_LEVEL
-        self.DATA_FILES = DATA_FILES
-        self.REPORT_CONFIG = REPORT_CONFIG
-        self.API_KEYS = API_KEYS
-        self.SCRAPING_SETTINGS = SCRAPING_SETTINGS
-        self.MODEL_CONFIG = MODEL_CONFIG
+    # Settings live on the class, so instances carry no per-instance state
+    __slots__ = ()
+    
+    BASE_DIR = BASE_DIR
+    DATA_DIR = DATA_DIR
+    LOGS_DIR = LOGS_DIR
+    REPORTS_DIR = REPORTS_DIR
+    TEMPLATES_DIR = TEMPLATES_DIR
+    PROPERTY_DATA_FILE = PROPERTY_DATA_FILE
+    COMPARABLE_SALES_FILE = COMPARABLE_SALES_FILE
+    LOG_FILE = LOG_FILE
+    SCRAPE_CACHE_DIR = SCRAPE_CACHE_DIR
+    REPORT_TEMPLATE = REPORT_TEMPLATE
+    COMPANY_NAME = COMPANY_NAME
+    COMPANY_LOGO = COMPANY_LOGO
+    DEFAULT_METHOD = DEFAULT_METHOD
+    VALUATION_METHODS = VALUATION_METHODS
+    LOG_LEVEL = LOG_LEVEL
+    DATA_FILES = DATA_FILES
+    REPORT_CONFIG = REPORT_CONFIG
+    API_KEYS = API_KEYS
+    SCRAPING_SETTINGS = SCRAPING_SETTINGS
+    PROXY_SETTINGS = PROXY_SETTINGS
+    MODEL_CONFIG = MODEL_CONFIG
 
 # Create a config instance for direct import
 config = Config()
 
+def ensure_dirs():
+    """Create every configured directory once per process"""
+    for directory in DIR_CONFIG.values():
+        ensure_dir(directory)
+
+_config_valid = False
+
 def validate_config() -> bool:
     """Validate that all required configuration is properly set up."""
+    global _config_valid
+    if _config_valid:
+        return True
     try:
-        required_dirs = [DATA_DIR, LOGS_DIR, REPORTS_DIR, TEMPLATES_DIR]
         required_files = [REPORT_TEMPLATE]
         
-        for directory in required_dirs:
-            if not directory.exists():
-                directory.mkdir(parents=True)
+        ensure_dirs()
                 
         for file in required_files:
             if not file.exists():
                 raise FileNotFoundError(f"Required file not found: {file}")
                 
+        _config_valid = True
         return True
     except Exception as e:
         print(f"Configuration validation failed: {str(e)}")
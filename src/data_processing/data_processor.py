@@ -1,99 +1,320 @@
+import numpy as np
 import pandas as pd
 import logging
+import os
+import stat
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Tuple, Union, Any
+from urllib.parse import urlparse
 PROPERTY_DATA_FILE = "data/property_data.csv"
 COMPARABLE_SALES_FILE = "data/comparable_sales.csv"
-from src.config import PROPERTY_DATA_FILE, COMPARABLE_SALES_FILE
-from src.web_scraping.scraper_manager import property_scraper
+from src.config import (
+    PROPERTY_DATA_FILE,
+    COMPARABLE_SALES_FILE,
+    PROPERTY_USECOLS,
+    PROPERTY_DTYPES,
+    COMPARABLE_USECOLS,
+    COMPARABLE_DTYPES,
+    CSV_CHUNK_SIZE,
+    MATCH_BLOCK_SIZE,
+    SCRAPING_SETTINGS
+)
+
+# Multithreaded Arrow CSV parsing when pyarrow is installed
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    CSV_ENGINE = 'pyarrow'
+    
+    # Config dtype names mapped to the Arrow column types declared at parse time
+    ARROW_COLUMN_TYPES = {
+        'str': pa.string(),
+        'category': pa.dictionary(pa.int32(), pa.string()),
+        'Int32': pa.int32(),
+        'float32': pa.float32()
+    }
+except ImportError:
+    CSV_ENGINE = 'c'
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Parquet snapshots are only kept for the configured data files, keyed by the CSV's stat
+SNAPSHOT_SOURCES = {Path(PROPERTY_DATA_FILE).resolve(), Path(COMPARABLE_SALES_FILE).resolve()}
+SNAPSHOT_SOURCE_KEY = b'source_csv_stat'
+
+
+@lru_cache(maxsize=8)
+def _read_csv(path: str, mtime_ns: int, size: int, usecols: tuple, dtype_items: tuple) -> pd.DataFrame:
+    """Parse a CSV file once per (path, mtime, size, schema) combination"""
+    if CSV_ENGINE != 'pyarrow':
+        try:
+            return pd.read_csv(path, usecols=lambda col: col in usecols, dtype=dict(dtype_items))
+        except ValueError as e:
+            logger.warning(f"Typed parse of {path} failed ({e}); coercing malformed cells to NaN")
+            frame = pd.read_csv(path, usecols=lambda col: col in usecols, dtype=dict(_text_dtypes(dtype_items)))
+            return _coerce_numeric(frame, dtype_items)
+    
+    # The pyarrow engine needs explicit column names, so resolve them from the header
+    header = pd.read_csv(path, nrows=0).columns
+    columns = [col for col in header if col in usecols]
+    
+    # A Parquet snapshot of the exact same CSV revision skips parsing entirely; only the
+    # configured data files are mirrored, never CSVs a caller points us at
+    snapshot = Path(path).with_suffix('.parquet') if Path(path).resolve() in SNAPSHOT_SOURCES else None
+    if snapshot is not None:
+        frame = _read_snapshot(snapshot, mtime_ns, size, columns, dtype_items)
+        if frame is not None:
+            return frame
+    
+    try:
+        frame = _arrow_read_csv(path, columns, dtype_items)
+    except ValueError as e:
+        # ArrowInvalid is a ValueError: one malformed cell should not fail the whole load
+        logger.warning(f"Typed parse of {path} failed ({e}); coercing malformed cells to NaN")
+        frame = _coerce_numeric(_arrow_read_csv(path, columns, _text_dtypes(dtype_items)), dtype_items)
+    if snapshot is not None:
+        _write_snapshot(frame, snapshot, path, mtime_ns, size)
+    return frame
+
+
+def _text_dtypes(dtype_items: tuple) -> tuple:
+    """Only the text declarations, so numeric columns parse leniently"""
+    return tuple((col, dtype) for col, dtype in dtype_items if dtype in ('str', 'category'))
+
+
+def _coerce_numeric(frame: pd.DataFrame, dtype_items: tuple) -> pd.DataFrame:
+    """Convert the declared numeric columns, turning malformed cells into NaN"""
+    for col, dtype in dtype_items:
+        if col in frame.columns and dtype not in ('str', 'category'):
+            frame[col] = pd.to_numeric(frame[col], errors='coerce').astype(dtype)
+    return frame
+
+
+def _arrow_read_csv(path: str, columns: List[str], dtype_items: tuple) -> pd.DataFrame:
+    """Parse a CSV with Arrow's multithreaded reader, typing columns up front"""
+    column_types = {
+        col: ARROW_COLUMN_TYPES[dtype]
+        for col, dtype in dtype_items
+        if col in columns and dtype in ARROW_COLUMN_TYPES
+    }
+    table = pacsv.read_csv(
+        path,
+        convert_options=pacsv.ConvertOptions(column_types=column_types, include_columns=columns)
+    )
+    # Keep integer counts as nullable Int32 rather than float64 when they have gaps
+    return table.to_pandas(types_mapper={pa.int32(): pd.Int32Dtype()}.get)
+
+
+def _read_snapshot(snapshot: Path, csv_mtime_ns: int, csv_size: int, columns: List[str],
+                   dtype_items: tuple) -> Optional[pd.DataFrame]:
+    """Load a Parquet snapshot if it was written from this CSV revision and matches the schema"""
+    try:
+        # Exact match on the recorded source stat: a CSV restored with an older mtime
+        # (cp -p, backups) or edited mid-read never reuses a stale snapshot
+        metadata = pq.read_schema(snapshot).metadata or {}
+        if metadata.get(SNAPSHOT_SOURCE_KEY) != f"{csv_mtime_ns}:{csv_size}".encode():
+            return None
+        frame = pd.read_parquet(snapshot, engine='pyarrow')
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable snapshot {snapshot}: {str(e)}")
+        return None
+    if list(frame.columns) != columns:
+        return None
+    # A snapshot written under an older dtype declaration is as stale as an old CSV
+    for col, dtype in dtype_items:
+        if col in frame.columns and dtype != 'str' and frame[col].dtype != dtype:
+            return None
+    return frame
+
+
+def _write_snapshot(frame: pd.DataFrame, snapshot: Path, path: str, csv_mtime_ns: int, csv_size: int):
+    """Best-effort Parquet mirror of a parsed CSV, tagged with the CSV revision it came from"""
+    try:
+        st = os.stat(path)
+        if (st.st_mtime_ns, st.st_size) != (csv_mtime_ns, csv_size):
+            return  # The CSV changed while it was being parsed
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        source = {SNAPSHOT_SOURCE_KEY: f"{csv_mtime_ns}:{csv_size}".encode()}
+        pq.write_table(table.replace_schema_metadata({**(table.schema.metadata or {}), **source}), snapshot)
+    except Exception as e:
+        logger.warning(f"Could not write snapshot {snapshot}: {str(e)}")
+
+
+def _read_csv_cached(file_path: Union[str, Path], usecols: tuple, dtypes: Dict[str, str]) -> pd.DataFrame:
+    """Return a private copy of the parsed CSV, re-reading only when the file has changed"""
+    st = os.stat(file_path)
+    frame = _read_csv(str(file_path), st.st_mtime_ns, st.st_size, usecols, tuple(dtypes.items()))
+    # The cached frame is shared across DataProcessor instances, so callers get a deep copy
+    return frame.copy()
+
+
+def _row_to_dict(row: pd.Series) -> Dict:
+    """Row as a plain dict, with nullable-integer gaps (pd.NA) handed out as float NaN"""
+    return {key: np.nan if value is pd.NA else value for key, value in row.items()}
+
+
+# Category code that never occurs, for subject types absent from the comparables
+NO_MATCH_CODE = -2
+
+# Module-level record type so comparables can be pickled across processes
+Comparable = namedtuple('Comparable', COMPARABLE_USECOLS)
+
+
+@dataclass(frozen=True)
+class SubjectBounds:
+    """Comparable search window derived from a subject property"""
+    type_code: Optional[int]
+    bedrooms: Optional[Tuple[float, float]]
+    bathrooms: Optional[Tuple[float, float]]
+    sqft: Optional[Tuple[float, float]]
+
+
+def _comparable_mask(type_codes: np.ndarray, subject_code: Optional[int],
+                     ranges: List[tuple], mask: Optional[np.ndarray] = None,
+                     scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    """Evaluate all comparable filters into one reused boolean buffer"""
+    if mask is None:
+        mask = np.empty(type_codes.shape[0], dtype=np.bool_)
+    if scratch is None:
+        scratch = np.empty_like(mask)
+    if subject_code is not None:
+        np.equal(type_codes, subject_code, out=mask)
+    else:
+        mask.fill(True)
+    for values, low, high in ranges:
+        mask &= np.greater_equal(values, low, out=scratch)
+        mask &= np.less_equal(values, high, out=scratch)
+    return mask
+
+
+def _first_k_matches(type_codes: np.ndarray, subject_code: Optional[int],
+                     ranges: List[tuple], max_k: int,
+                     block_size: int = MATCH_BLOCK_SIZE) -> np.ndarray:
+    """Return the row positions of the first max_k matches, scanning block by block"""
+    hits = []
+    found = 0
+    # One pair of mask buffers serves every block; the last block uses a prefix view
+    mask_buf = np.empty(min(block_size, type_codes.shape[0]), dtype=np.bool_)
+    scratch_buf = np.empty_like(mask_buf)
+    for start in range(0, type_codes.shape[0], block_size):
+        stop = start + block_size
+        block_codes = type_codes[start:stop]
+        n = block_codes.shape[0]
+        block_ranges = [(values[start:stop], low, high) for values, low, high in ranges]
+        mask = _comparable_mask(block_codes, subject_code, block_ranges, mask_buf[:n], scratch_buf[:n])
+        block_hits = np.flatnonzero(mask)
+        if block_hits.size:
+            hits.append(block_hits + start)
+            found += block_hits.size
+            if found >= max_k:
+                break
+    if not hits:
+        return np.empty(0, dtype=np.intp)
+    return np.concatenate(hits)[:max_k]
+
 
 class DataProcessor:
     def __init__(self):
         """Initialize data processor with empty DataFrames"""
         self.property_data = pd.DataFrame()
         self.comparable_sales = pd.DataFrame()
+        self._id_index = {}
+        self._comparables_cache = {}
+        self._positions_cache = {}
+        self._bounds_cache = {}
+        self._details_cache = {}
+        self._load_lock = threading.Lock()
+        self.data_version = 0
+        self._bed = self._bath = self._sqft = self._ptype_codes = np.empty(0)
+        self._price = None
         logger.info("DataProcessor initialized")
 
     def _validate_file(self, file_path: Union[str, Path]) -> bool:
         """Validate that a file exists and is readable"""
+        path = Path(file_path)
         try:
-            path = Path(file_path)
-            if not path.exists():
-                logger.error(f"File not found: {path}")
-                return False
-            if not path.is_file():
+            # One stat call answers existence, file type and size together
+            st = os.stat(path)
+            if not stat.S_ISREG(st.st_mode):
                 logger.error(f"Path is not a file: {path}")
                 return False
-            if path.stat().st_size == 0:
+            if st.st_size == 0:
                 logger.error(f"File is empty: {path}")
                 return False
             return True
+        except FileNotFoundError:
+            logger.error(f"File not found: {path}")
+            return False
         except Exception as e:
             logger.error(f"Error validating file {path}: {str(e)}")
             return False
 
     def load_data_from_csv(self, csv_path: Union[str, Path]) -> bool:
         """Load property data from CSV file with robust error handling"""
-        try:
-            # Define the files to load
-            data_files = {
-                'property_data': PROPERTY_DATA_FILE,
-                'comparable_sales': COMPARABLE_SALES_FILE
-            }
-            
-            # Validate files before loading
-            if not all(self._validate_file(f) for f in data_files.values()):
-                return False
-            
-            # Load data
-            self.property_data = pd.read_csv(PROPERTY_DATA_FILE)
-            self.comparable_sales = pd.read_csv(COMPARABLE_SALES_FILE)
-            
-            # Clean and validate data
-            self._clean_data()
-            
-            logger.info("Successfully loaded all data")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Error loading data: {str(e)}")
-            return False
+        # Same error handling as load_data; the given CSV replaces the default property file
+        return self.load_data(csv_path)
 
     def scrape_property_data(self, urls: List[str]) -> bool:
-        """Scrape property data from URLs with comprehensive error handling"""
-        properties = []
-        def scrape_property_data(self, urls: list) -> bool:
-            """Scrape property data from URLs"""
-            properties = []
-            for url in urls:
-                scraped_data = property_scraper(url)
-                if scraped_data:
-                    properties.append(scraped_data)
+        """Scrape property data from URLs concurrently, keeping each site's requests sequential"""
+        # Scrapers pull in selenium/requests; only load them when actually scraping
+        from src.web_scraping.scraper_manager import property_scraper
         
-            if properties:
-                self.property_data = pd.DataFrame(properties)
-                logger.info(f"Scraped {len(properties)} properties")
-                return True
+        # One lock per domain: different sites are scraped in parallel, while requests
+        # to the same site stay serialized and spaced by the configured delay
+        domain_locks = {urlparse(url).netloc: threading.Lock() for url in urls}
+        last_request = {}
+        
+        def scrape_one(url: str) -> Optional[Dict]:
+            domain = urlparse(url).netloc
+            with domain_locks[domain]:
+                if domain in last_request:
+                    wait = SCRAPING_SETTINGS['delay'] - (time.monotonic() - last_request[domain])
+                    if wait > 0:
+                        time.sleep(wait)
+                try:
+                    return property_scraper(url)
+                finally:
+                    last_request[domain] = time.monotonic()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, len(domain_locks))) as executor:
+                properties = [data for data in executor.map(scrape_one, urls) if data]
+        except Exception as e:
+            logger.error(f"Error scraping property data: {str(e)}")
             return False
         
+        if properties:
+            # Explicit column order (known schema first) spares pandas the per-row key inference
+            seen = set().union(*properties)
+            columns = [col for col in PROPERTY_USECOLS if col in seen]
+            columns += sorted(seen.difference(columns))
+            self.property_data = pd.DataFrame.from_records(properties, columns=columns)
+            # Scraped rows replace the loaded ones, so lookups and caches are rebuilt the same way
+            self._clean_data()
+            logger.info(f"Scraped {len(properties)} properties")
+            return True
+        
         logger.error("No valid properties scraped from URLs")
         return False
 
-    def load_data(self,  property_data_file: Union[str, Path], comparable_sales_file: Union[str, Path]) -> bool:
+    def load_data(self, property_data_file: Union[str, Path] = PROPERTY_DATA_FILE,
+                  comparable_sales_file: Union[str, Path] = COMPARABLE_SALES_FILE) -> bool:
         """Load both property and comparable sales data with validation"""
         try:
-            # Validate files before loading
-            if not all(self._validate_file(f) for f in [PROPERTY_DATA_FILE, COMPARABLE_SALES_FILE]):
-                return False
-            
-            # Load data
-            self.property_data = pd.read_csv(PROPERTY_DATA_FILE)
-            self.comparable_sales = pd.read_csv(COMPARABLE_SALES_FILE)
+            # Load data; a missing file surfaces as FileNotFoundError from the read itself
+            self.property_data = _read_csv_cached(property_data_file, PROPERTY_USECOLS, PROPERTY_DTYPES)
+            self.comparable_sales = _read_csv_cached(comparable_sales_file, COMPARABLE_USECOLS, COMPARABLE_DTYPES)
             
             # Clean and validate data
             self._clean_data()
@@ -101,115 +322,315 @@ class DataProcessor:
             logger.info("Successfully loaded all data")
             return True
             
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {e.filename}")
+            return False
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}")
             return False
 
+    def _ensure_loaded(self) -> bool:
+        """Load the default comparable sales once, keeping property data that was already loaded or scraped"""
+        # Valuation methods run concurrently against one processor, so only one thread loads
+        with self._load_lock:
+            if not self.comparable_sales.empty:
+                return True
+            if self.property_data.empty:
+                return self.load_data()
+            
+            try:
+                self.comparable_sales = _read_csv_cached(COMPARABLE_SALES_FILE, COMPARABLE_USECOLS, COMPARABLE_DTYPES)
+                self._clean_data()
+                return True
+            except FileNotFoundError as e:
+                logger.error(f"File not found: {e.filename}")
+                return False
+            except Exception as e:
+                logger.error(f"Error loading comparable sales: {str(e)}")
+                return False
+
     def _clean_data(self):
         """Clean and standardize loaded data"""
+        # Freshly loaded data invalidates memoized lookups
+        self._comparables_cache.clear()
+        self._positions_cache.clear()
+        self._bounds_cache.clear()
+        self._details_cache.clear()
+        self.data_version += 1
+        
         # Clean property data
         if 'id' in self.property_data.columns:
-            self.property_data['id'] = self.property_data['id'].astype(str).str.strip()
+            # Scraped IDs may not be strings, so normalize everything but the gaps
+            ids = self.property_data['id']
+            self.property_data['id'] = ids.where(ids.isna(), ids.astype(str).str.strip())
+        self._build_id_index()
+        
+        # Share one category set so property types compare as integer codes
+        if 'property_type' in self.comparable_sales.columns:
+            property_types = set(self.comparable_sales['property_type'].dropna())
+            if 'property_type' in self.property_data.columns:
+                property_types.update(self.property_data['property_type'].dropna())
+            categories = sorted(property_types)
+            
+            def shared_categories(column: pd.Series) -> pd.Series:
+                # astype() is a no-op for an equal category set in another order,
+                # so already-categorical columns are recoded explicitly
+                if isinstance(column.dtype, pd.CategoricalDtype):
+                    return column.cat.set_categories(categories)
+                return column.astype(pd.CategoricalDtype(categories))
+            
+            self.comparable_sales['property_type'] = shared_categories(self.comparable_sales['property_type'])
+            if 'property_type' in self.property_data.columns:
+                self.property_data['property_type'] = shared_categories(self.property_data['property_type'])
         
-        # Clean comparable sales
-        numeric_cols = ['bedrooms', 'bathrooms', 'sqft', 'lot_size', 'year_built']
-        for col in numeric_cols:
-            if col in self.comparable_sales.columns:
-                self.comparable_sales[col] = pd.to_numeric(self.comparable_sales[col], errors='coerce')
+        self._cache_filter_columns()
+
+    def _cache_filter_columns(self):
+        """Keep the comparable filter columns as contiguous NumPy arrays"""
+        comps = self.comparable_sales
+        
+        def column_array(col: str) -> np.ndarray:
+            if col not in comps.columns:
+                return np.full(len(comps), np.nan)
+            return comps[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        self._bed = column_array('bedrooms')
+        self._bath = column_array('bathrooms')
+        self._sqft = column_array('sqft')
+        self._price = column_array('sale_price')
+        if 'property_type' in comps.columns and isinstance(comps['property_type'].dtype, pd.CategoricalDtype):
+            self._ptype_codes = comps['property_type'].cat.codes.to_numpy()
+        else:
+            self._ptype_codes = np.full(len(comps), -1, dtype=np.int8)
+
+    def _build_id_index(self):
+        """Map each property ID to its first row position for O(1) lookups"""
+        self._id_index = {}
+        if 'id' in self.property_data.columns:
+            ids = self.property_data['id']
+            first = ~ids.duplicated(keep='first').to_numpy()
+            self._id_index = dict(zip(ids.to_numpy()[first], np.flatnonzero(first).tolist()))
 
     def get_scraped_property_details(self) -> Optional[Dict]:
         """Get details of the first scraped property"""
         if not self.property_data.empty:
-            return self.property_data.iloc[0].to_dict()
+            return _row_to_dict(self.property_data.iloc[0])
         logger.warning("No property data available")
         return None
 
+    def _find_in_chunks(self, property_id: str) -> Optional[Dict]:
+        """Stream the property CSV in chunks and stop at the first matching row"""
+        if not self._validate_file(PROPERTY_DATA_FILE):
+            return None
+            
+        chunks = pd.read_csv(
+            PROPERTY_DATA_FILE,
+            chunksize=CSV_CHUNK_SIZE,
+            usecols=lambda col: col in PROPERTY_USECOLS,
+            dtype=PROPERTY_DTYPES
+        )
+        with chunks:
+            for chunk in chunks:
+                hit = chunk[chunk['id'].str.strip() == property_id]
+                if len(hit):
+                    return _row_to_dict(hit.iloc[0])
+                    
+        logger.warning(f"No property found with ID: {property_id}")
+        return None
+
+    def _find_with_arrow(self, property_id: str) -> Optional[Dict]:
+        """Filter the property CSV with Arrow and materialize only the matching row"""
+        if not self._validate_file(PROPERTY_DATA_FILE):
+            return None
+            
+        # Same column types as a full load so a pre-load lookup returns identical values
+        csv_format = ds.CsvFileFormat(
+            convert_options=pacsv.ConvertOptions(column_types={
+                col: ARROW_COLUMN_TYPES[dtype]
+                for col, dtype in PROPERTY_DTYPES.items()
+                if dtype in ARROW_COLUMN_TYPES
+            })
+        )
+        dataset = ds.dataset(PROPERTY_DATA_FILE, format=csv_format)
+        columns = [col for col in dataset.schema.names if col in PROPERTY_USECOLS]
+        table = dataset.to_table(filter=pc.utf8_trim_whitespace(ds.field('id')) == property_id, columns=columns)
+        
+        if table.num_rows:
+            # Through pandas so nulls come back as NaN like the loaded-frame path
+            row = _row_to_dict(table.slice(0, 1).to_pandas().iloc[0])
+            row['id'] = property_id
+            return row
+        logger.warning(f"No property found with ID: {property_id}")
+        return None
+
     def get_property_details(self, property_id: Union[int, str]) -> Optional[Dict]:
         """Get details for a specific property with robust error handling"""
         try:
-            if self.property_data.empty and not self.load_data():
-                logger.error("No property data available")
-                return None
-            
             # Standardize ID format
             property_id = str(property_id).strip()
+            
+            # Single lookups before a full load only read until the first match
+            if self.property_data.empty:
+                if CSV_ENGINE == 'pyarrow':
+                    return self._find_with_arrow(property_id)
+                return self._find_in_chunks(property_id)
+            
             if 'id' not in self.property_data.columns:
                 logger.error("'id' column not found in property data")
                 return None
             
-            # Find matching property
-            matches = self.property_data[
-                self.property_data['id'].astype(str).str.strip() == property_id
-            ]
+            # Rows are memoized per load; callers get a shallow copy they may modify
+            cached = self._details_cache.get(property_id)
+            if cached is not None:
+                return dict(cached)
             
-            if matches.empty:
+            # Find matching property via the index built at load time
+            position = self._id_index.get(property_id)
+            if position is None:
                 logger.warning(f"No property found with ID: {property_id}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Available IDs: %s", self.property_data['id'].head(20).tolist())
                 return None
                 
-            return matches.iloc[0].to_dict()
+            details = self._details_cache[property_id] = _row_to_dict(self.property_data.iloc[position])
+            return dict(details)
             
         except Exception as e:
             logger.error(f"Error getting property details: {str(e)}")
             return None
 
+    def _subject_bounds(self, property_id: str) -> Optional[SubjectBounds]:
+        """Compute the comparable search window for a subject once per load"""
+        if property_id in self._bounds_cache:
+            return self._bounds_cache[property_id]
+            
+        subject = self.get_property_details(property_id)
+        if not subject:
+            return None
+        
+        # Property type filter on categorical codes
+        type_code = None
+        if pd.notna(subject.get('property_type')):
+            property_types = self.comparable_sales['property_type'].cat.categories
+            if subject['property_type'] in property_types:
+                type_code = property_types.get_loc(subject['property_type'])
+            else:
+                type_code = NO_MATCH_CODE
+        
+        bedrooms = subject.get('bedrooms')
+        bathrooms = subject.get('bathrooms')
+        sqft = subject.get('sqft')
+        bounds = SubjectBounds(
+            type_code=type_code,
+            bedrooms=(max(1, bedrooms - 1), bedrooms + 1) if pd.notna(bedrooms) else None,  # ±1
+            bathrooms=(max(1, bathrooms - 0.5), bathrooms + 0.5) if pd.notna(bathrooms) else None,  # ±0.5
+            sqft=(sqft * 0.8, sqft * 1.2) if pd.notna(sqft) else None  # ±20%
+        )
+        self._bounds_cache[property_id] = bounds
+        return bounds
+
     def get_comparable_sales(self, property_id: Union[int, str], 
                            radius_miles: float = 5, 
-                           max_comparables: int = 5) -> Optional[List[Dict]]:
-        """Get comparable sales for a property with comprehensive validation"""
+                           max_comparables: int = 5) -> Optional[List[tuple]]:
+        """Get comparable sales for a property, memoized until data is reloaded"""
+        key = (str(property_id).strip(), radius_miles, max_comparables)
+        if key not in self._comparables_cache:
+            self._comparables_cache[key] = self._find_comparable_sales(*key)
+        return self._comparables_cache[key]
+
+    def get_comparable_columns(self, property_id: Union[int, str],
+                               radius_miles: float = 5,
+                               max_comparables: int = 5) -> Optional[Dict[str, np.ndarray]]:
+        """Columnar view of the comparable sales: one float64 array per numeric field"""
+        positions = self._comparable_positions(str(property_id).strip(), radius_miles, max_comparables)
+        if positions is None or self._price is None:
+            return None
+        return {
+            'sale_price': self._price[positions],
+            'sqft': self._sqft[positions],
+            'bedrooms': self._bed[positions],
+            'bathrooms': self._bath[positions]
+        }
+
+    def get_properties_bulk(self, property_ids: List[Union[int, str]]) -> pd.DataFrame:
+        """Subject rows for many property IDs in one positional take; unknown IDs are skipped"""
         try:
-            # Get subject property
-            subject = self.get_property_details(property_id)
-            if not subject:
+            if self.property_data.empty and not self.load_data():
+                return pd.DataFrame()
+            positions = [self._id_index.get(str(property_id).strip()) for property_id in property_ids]
+            subjects = self.property_data.iloc[[p for p in positions if p is not None]].reset_index(drop=True)
+            # Nullable integer counts go out as float64 so gaps are NaN, as in single-row lookups
+            return subjects.astype({col: 'float64' for col, dtype in subjects.dtypes.items()
+                                    if isinstance(dtype, pd.Int32Dtype)})
+        except Exception as e:
+            logger.error(f"Error getting property details in bulk: {str(e)}")
+            return pd.DataFrame()
+
+    def get_comparables_bulk(self, property_ids: List[Union[int, str]],
+                             radius_miles: float = 5,
+                             max_comparables: int = 5) -> Dict[str, np.ndarray]:
+        """Comparable columns for many properties, concatenated in order with per-property counts"""
+        matches = [self._comparable_positions(str(property_id).strip(), radius_miles, max_comparables)
+                   for property_id in property_ids]
+        counts = np.fromiter((0 if m is None else len(m) for m in matches), dtype=np.intp, count=len(matches))
+        found = [m for m in matches if m is not None]
+        if not found or self._price is None:
+            empty = np.empty(0)
+            return {'sale_price': empty, 'sqft': empty, 'bedrooms': empty, 'bathrooms': empty,
+                    'counts': np.zeros(len(matches), dtype=np.intp)}
+        positions = np.concatenate(found)
+        return {
+            'sale_price': self._price[positions],
+            'sqft': self._sqft[positions],
+            'bedrooms': self._bed[positions],
+            'bathrooms': self._bath[positions],
+            'counts': counts
+        }
+
+    def _find_comparable_sales(self, property_id: str, radius_miles: float,
+                               max_comparables: int) -> Optional[List[tuple]]:
+        """Get comparable sales for a property as lightweight namedtuples"""
+        positions = self._comparable_positions(property_id, radius_miles, max_comparables)
+        if positions is None:
+            return None
+        rows = self.comparable_sales.iloc[positions].reindex(columns=Comparable._fields)
+        return list(map(Comparable._make, rows.itertuples(index=False, name=None)))
+
+    def _comparable_positions(self, property_id: str, radius_miles: float,
+                              max_comparables: int) -> Optional[np.ndarray]:
+        """Row positions of the comparable sales, memoized until data is reloaded"""
+        key = (property_id, radius_miles, max_comparables)
+        if key not in self._positions_cache:
+            self._positions_cache[key] = self._match_comparables(*key)
+        return self._positions_cache[key]
+
+    def _match_comparables(self, property_id: str, radius_miles: float,
+                           max_comparables: int) -> Optional[np.ndarray]:
+        """Find comparable sale positions for a property with comprehensive validation"""
+        try:
+            if not self._ensure_loaded():
                 return None
             
-            # Validate comparable sales data
-            if self.comparable_sales.empty and not self.load_data():
+            bounds = self._subject_bounds(property_id)
+            if bounds is None:
                 return None
             
-            # Filter comparables (enhanced logic)
-            comparables = self.comparable_sales.copy()
-            
-            # Property type filter
-            if 'property_type' in subject:
-                comparables = comparables[
-                    comparables['property_type'] == subject['property_type']
-                ]
-            
-            # Bedrooms filter (±1)
-            if 'bedrooms' in subject:
-                comparables = comparables[
-                    comparables['bedrooms'].between(
-                        max(1, subject['bedrooms'] - 1),
-                        subject['bedrooms'] + 1
-                    )
-                ]
-            
-            # Bathrooms filter (±0.5)
-            if 'bathrooms' in subject:
-                comparables = comparables[
-                    comparables['bathrooms'].between(
-                        max(1, subject['bathrooms'] - 0.5),
-                        subject['bathrooms'] + 0.5
-                    )
-                ]
-            
-            # Square footage filter (±20%)
-            if 'sqft' in subject:
-                comparables = comparables[
-                    comparables['sqft'].between(
-                        subject['sqft'] * 0.8,
-                        subject['sqft'] * 1.2
-                    )
-                ]
-            
-            # Limit results
-            comparables = comparables.head(max_comparables)
-            
-            if comparables.empty:
+            # Numeric range filters, skipped when the subject value is missing
+            ranges = [
+                (values, *window)
+                for values, window in ((self._bed, bounds.bedrooms),
+                                       (self._bath, bounds.bathrooms),
+                                       (self._sqft, bounds.sqft))
+                if window is not None
+            ]
+            
+            # Stop scanning once max_comparables matches are found
+            positions = _first_k_matches(self._ptype_codes, bounds.type_code, ranges, max_comparables)
+            
+            if len(positions) == 0:
                 logger.warning("No comparable sales found matching criteria")
                 return None
-                
-            return comparables.to_dict('records')
+            return positions
             
         except Exception as e:
             logger.error(f"Error getting comparable sales: {str(e)}")
@@ -1,17 +1,147 @@
-from docxtpl import DocxTemplate
-from src.config import REPORT_TEMPLATE, OUTPUT_DIR, COMPANY_NAME
+from docx import Document
+from docx.shared import Mm
+from src.config import REPORT_TEMPLATE, OUTPUT_DIR, COMPANY_NAME, CHART_DPI, ensure_dir, ensure_output_dir
+from concurrent.futures import ProcessPoolExecutor
+from bisect import bisect_right
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-import matplotlib.pyplot as plt
-from docx import Document
-from docx.shared import Pt
 import logging
 import os
+import io
+import re
+from xml.sax.saxutils import escape
+import numpy as np
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# matplotlib, docxtpl and jinja2 are imported on first use so a report
+# without a chart, or a plain-placeholder template, never pays for them
+_matplotlib_configured = False
+
+# Shared Jinja2 environment so template filters are compiled once per process
+_jinja_env = None
+
+def _configure_matplotlib():
+    """Select the Agg backend and apply chart styling once per process"""
+    global _matplotlib_configured
+    if not _matplotlib_configured:
+        import matplotlib
+        matplotlib.use('Agg')  # Non-interactive backend, set before anything can touch pyplot
+        from matplotlib import style as mpl_style
+        mpl_style.use('seaborn-whitegrid')
+        matplotlib.rcParams.update({'axes.grid': True, 'grid.linestyle': '--', 'grid.alpha': 0.7})
+        _matplotlib_configured = True
+
+def _get_jinja_env():
+    """Create the shared Jinja2 environment on first use"""
+    global _jinja_env
+    if _jinja_env is None:
+        from jinja2 import Environment
+        _jinja_env = Environment()
+    return _jinja_env
+
+# Simple {{ name }} / {{ name.field }} placeholders; anything else needs Jinja
+_PLACEHOLDER_RE = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+_CHART_PLACEHOLDER = 'comparative_chart'
+
+def _flatten_context(context: dict, prefix: str = '') -> dict:
+    """Flatten nested context dicts into dotted placeholder keys"""
+    flat = {}
+    for key, value in context.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten_context(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+@lru_cache(maxsize=4)
+def _default_template_bytes(company_name: str) -> bytes:
+    """Build the default template once per company name and return it as .docx bytes"""
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import nsdecls
+    from docx.shared import Pt
+    
+    doc = Document()
+    
+    # Set document styles
+    styles = doc.styles
+    title_style = styles['Title']
+    title_style.font.size = Pt(20)
+    title_style.font.bold = True
+    
+    heading1 = styles['Heading 1']
+    heading1.font.size = Pt(16)
+    heading1.font.bold = True
+    
+    title, heading = title_style.style_id, heading1.style_id
+    paragraphs = (
+        # Document header
+        (title, company_name),
+        (heading, 'PROPERTY VALUATION REPORT'),
+        (None, 'Date: {{report_date}}'),
+        (None, 'Report ID: {{report_id}}'),
+        # Property details section
+        (heading, 'PROPERTY INFORMATION'),
+        (None, 'Address: {{property.address}}'),
+        (None, 'City: {{property.city}}'),
+        (None, 'State: {{property.state}} | ZIP: {{property.zip_code}}'),
+        (None, 'Type: {{property.property_type}}'),
+        (None, 'Bedrooms: {{property.bedrooms}} | Bathrooms: {{property.bathrooms}}'),
+        (None, 'Sq Ft: {{property.sqft}} | Lot Size: {{property.lot_size}}'),
+        (None, 'Year Built: {{property.year_built}}'),
+        # Valuation results section
+        (heading, 'VALUATION ANALYSIS'),
+        (None, 'Primary Method: {{valuation.primary_method}}'),
+        (None, 'Estimated Value: {{valuation.primary_value}}'),
+        (None, 'Confidence Level: {{valuation.primary_confidence}}'),
+        # Comparative analysis section
+        (heading, 'COMPARATIVE ANALYSIS'),
+        (None, '{{comparative_chart}}'),
+    )
+    
+    # Build all paragraphs as one OXML fragment and splice it in ahead of sectPr
+    xml = ''.join(
+        '<w:p>'
+        + (f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else '')
+        + f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+        for style, text in paragraphs
+    )
+    fragment = parse_xml(f'<w:body {nsdecls("w")}>{xml}</w:body>')
+    body = doc.element.body
+    position = body.index(body.sectPr) if body.sectPr is not None else len(body)
+    body[position:position] = list(fragment)
+    
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+@lru_cache(maxsize=4)
+def _read_template(path: str, mtime_ns: int, size: int) -> tuple:
+    """Read a template once per (path, mtime, size) and classify its placeholders"""
+    data = Path(path).read_bytes()
+    return data, ReportGenerator._is_fixed_schema(data)
+
+@lru_cache(maxsize=1)
+def _format_report_date(day) -> str:
+    """Locale-aware long date, formatted once per calendar day"""
+    return day.strftime("%B %d, %Y")
+
+# Per-process generator used by generate_reports workers
+_worker_generator = None
+
+def _init_worker(template_path: str, company_name: str):
+    """Build one ReportGenerator per worker so its template cache is reused"""
+    global _worker_generator
+    _worker_generator = ReportGenerator(template_path, company_name)
+
+def _generate_one(job: tuple, data_source: str = None) -> Path:
+    """Generate a single report inside a worker process"""
+    property_details, valuation_results = job
+    return _worker_generator.generate_report(property_details, valuation_results, data_source)
+
 class ReportGenerator:
     DEFAULT_PROPERTY_VALUES = {
         'address': 'N/A',
@@ -30,82 +160,147 @@ class ReportGenerator:
         self.template_path = Path(template_path) if template_path else Path(REPORT_TEMPLATE)
         self.output_dir = Path(OUTPUT_DIR)
         self.company_name = company_name or COMPANY_NAME
+        self._template = None  # (bytes, fixed_schema) once validated and loaded
+        
+        # One figure/canvas reused for every chart, created with the first chart
+        self._fig = None
+        self._ax = None
         self.ensure_directories_exist()
 
     def ensure_directories_exist(self):
-        """Ensure required directories exist"""
-        self.template_path.parent.mkdir(parents=True, exist_ok=True)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+        """Ensure the template directory exists; output is created on first write"""
+        ensure_dir(self.template_path.parent)
 
     def create_default_template(self):
         """Generate a professional default template"""
-        doc = Document()
-        
-        # Set document styles
-        styles = doc.styles
-        title_style = styles['Title']
-        title_style.font.size = Pt(20)
-        title_style.font.bold = True
-        
-        heading1 = styles['Heading 1']
-        heading1.font.size = Pt(16)
-        heading1.font.bold = True
-        
-        # Document header
-        doc.add_paragraph(self.company_name, style='Title')
-        doc.add_paragraph('PROPERTY VALUATION REPORT', style='Heading 1')
-        doc.add_paragraph('Date: {{report_date}}')
-        doc.add_paragraph('Report ID: {{report_id}}')
-        
-        # Property details section
-        doc.add_paragraph('PROPERTY INFORMATION', style='Heading 1')
-        doc.add_paragraph('Address: {{property.address}}')
-        doc.add_paragraph('City: {{property.city}}')
-        doc.add_paragraph('State: {{property.state}} | ZIP: {{property.zip_code}}')
-        doc.add_paragraph('Type: {{property.property_type}}')
-        doc.add_paragraph('Bedrooms: {{property.bedrooms}} | Bathrooms: {{property.bathrooms}}')
-        doc.add_paragraph('Sq Ft: {{property.sqft}} | Lot Size: {{property.lot_size}}')
-        doc.add_paragraph('Year Built: {{property.year_built}}')
-        
-        # Valuation results section
-        doc.add_paragraph('VALUATION ANALYSIS', style='Heading 1')
-        doc.add_paragraph('Primary Method: {{valuation.primary_method}}')
-        doc.add_paragraph('Estimated Value: {{valuation.primary_value}}')
-        doc.add_paragraph('Confidence Level: {{valuation.primary_confidence}}')
-        
-        # Comparative analysis section
-        doc.add_paragraph('COMPARATIVE ANALYSIS', style='Heading 1')
-        doc.add_paragraph('{{comparative_chart}}')
-        
-        # Save template
-        doc.save(self.template_path)
+        self.template_path.write_bytes(_default_template_bytes(self.company_name))
         logger.info(f"Created new template at {self.template_path}")
 
     def ensure_valid_template(self):
-        """Ensure a valid template exists"""
-        if not self.template_path.exists() or self.template_path.stat().st_size < 1024:
+        """Ensure a valid template exists and is loaded; later calls touch no files"""
+        if self._template is not None:
+            return self.template_path
+        try:
+            size = self.template_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < 1024:
             logger.warning("Template missing or invalid - creating default")
             self.create_default_template()
+        self._template = self._load_template(self.template_path)
         return self.template_path
 
+    def invalidate_template(self):
+        """Force the template to be re-validated and re-read on the next report"""
+        self._template = None
+        _read_template.cache_clear()
+
+    def _load_template(self, path: Path) -> tuple:
+        """Return (bytes, fixed_schema) for the template, shared by every generator in the process"""
+        st = path.stat()
+        return _read_template(str(path), st.st_mtime_ns, st.st_size)
+
+    @staticmethod
+    def _is_fixed_schema(data: bytes) -> bool:
+        """True when the template only uses plain {{ name }} placeholders (no Jinja tags or filters)"""
+        doc = Document(io.BytesIO(data))
+        for paragraph in ReportGenerator._iter_paragraphs(doc):
+            text = paragraph.text
+            if '{%' in text or '{#' in text or text.count('{{') != len(_PLACEHOLDER_RE.findall(text)):
+                return False
+        return True
+
+    @staticmethod
+    def _iter_paragraphs(doc):
+        """Yield body, header and footer paragraphs, including those inside tables"""
+        def block_paragraphs(container):
+            yield from container.paragraphs
+            for table in container.tables:
+                for row in table.rows:
+                    for cell in row.cells:
+                        yield from cell.paragraphs
+        
+        yield from block_paragraphs(doc)
+        for section in doc.sections:
+            for part in (section.header, section.first_page_header, section.even_page_header,
+                         section.footer, section.first_page_footer, section.even_page_footer):
+                # A linked header/footer has no content of its own, and touching it would add one
+                if not part.is_linked_to_previous:
+                    yield from block_paragraphs(part)
+
+    @staticmethod
+    def _replace_in_runs(paragraph, replace):
+        """Substitute placeholders run by run so each run keeps its formatting"""
+        runs = paragraph.runs
+        starts, position = [], 0
+        for run in runs:
+            starts.append(position)
+            position += len(run.text)
+        text = ''.join(run.text for run in runs)
+        
+        # Right to left, so offsets of earlier placeholders stay valid
+        for match in reversed(list(_PLACEHOLDER_RE.finditer(text))):
+            first = bisect_right(starts, match.start()) - 1
+            last = bisect_right(starts, match.end() - 1) - 1
+            head = runs[first].text[:match.start() - starts[first]]
+            tail = runs[last].text[match.end() - starts[last]:]
+            # A placeholder Word split across runs takes the formatting of its first run
+            for run in runs[first + 1:last + 1]:
+                run.text = ''
+            runs[first].text = head + replace(match) + tail
+
+    def _render_with_python_docx(self, data: bytes, context: dict, chart: io.BytesIO = None):
+        """Fill plain placeholders directly with python-docx, skipping Jinja2 entirely"""
+        doc = Document(io.BytesIO(data))
+        flat_ctx = _flatten_context(context)
+        replace = lambda m: str(flat_ctx.get(m.group(1), ''))
+        for paragraph in self._iter_paragraphs(doc):
+            text = paragraph.text
+            if '{{' not in text:
+                continue
+            match = _PLACEHOLDER_RE.fullmatch(text.strip())
+            if match and match.group(1) == _CHART_PLACEHOLDER:
+                paragraph.text = ''
+                if chart:
+                    paragraph.add_run().add_picture(chart, width=Mm(150))
+                continue
+            self._replace_in_runs(paragraph, replace)
+        return doc
+
     def generate_report(self, property_details: dict, valuation_results: list, data_source: str = None) -> Path:
         """Generate a professional valuation report"""
+        now = datetime.now()  # single timestamp for the report ID, date and any error file
+        # Callers may pass one result or a ranked list; helpers always get a list
+        if not isinstance(valuation_results, list):
+            valuation_results = [valuation_results]
         try:
+            ensure_output_dir()
+            
             # Prepare context data
-            context = self.prepare_context(property_details, valuation_results)
+            context = self.prepare_context(property_details, valuation_results, now)
+            
+            self.ensure_valid_template()
+            template_data, fixed_schema = self._template
             
-            # Generate charts
-            context['comparative_chart'] = self.generate_comparison_chart(
-                valuation_results, 
-                context['report_id']
-            )
+            # Generate charts in memory and embed them directly
+            chart = self.generate_comparison_chart(valuation_results)
             
-            # Render and save report
-            doc = DocxTemplate(self.ensure_valid_template())
-            doc.render(context)
+            # Render: plain placeholder templates skip docxtpl's Jinja pass
+            if fixed_schema:
+                doc = self._render_with_python_docx(template_data, context, chart)
+            else:
+                from docxtpl import DocxTemplate, InlineImage
+                # DocxTemplate mutates its document on render, so each report gets its own copy
+                doc = DocxTemplate(io.BytesIO(template_data))
+                context[_CHART_PLACEHOLDER] = InlineImage(doc, chart, width=Mm(150)) if chart else None
+                doc.render(context, jinja_env=_get_jinja_env())
             
+            # Serialize the zip in memory, then write it out in one call
+            buf = io.BytesIO()
+            doc.save(buf)
             output_path = self.output_dir / f"{context['report_id']}.docx"
-            doc.save(output_path)
+            with open(output_path, 'wb', buffering=1024 * 1024) as f:
+                f.write(buf.getbuffer())
             
             logger.info(f"Report generated: {output_path}")
             return output_path
@@ -113,46 +308,84 @@ class ReportGenerator:
         except Exception as e:
             logger.error(f"Report generation failed: {str(e)}")
             # Create minimal error report
-            error_path = self.output_dir / f"error_report_{datetime.now().strftime('%H%M%S')}.txt"
+            error_path = self.output_dir / f"error_report_{now:%H%M%S}.txt"
             with open(error_path, 'w') as f:
                 f.write(f"Report Generation Error\n{str(e)}")
             return error_path
 
-    def prepare_context(self, property_details: dict, valuation_results: list) -> dict:
+    def generate_reports(self, properties: list, results: list, data_source: str = None) -> list:
+        """Generate reports for many properties in parallel worker processes"""
+        jobs = list(zip(properties, results))
+        if len(jobs) < 2:
+            return [self.generate_report(p, r, data_source) for p, r in jobs]
+        
+        # Create the template up front so workers don't race to write it
+        self.ensure_valid_template()
+        workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.template_path), self.company_name)) as executor:
+            return list(executor.map(_generate_one, jobs, repeat(data_source)))
+
+    def prepare_context(self, property_details: dict, valuation_results: list, now: datetime = None) -> dict:
         """Prepare data context for report rendering"""
         # Generate unique report ID
-        report_id = f"REP-{property_details.get('id', 'UNK')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+        now = now or datetime.now()
+        stamp = f"{now.year:04d}{now.month:02d}{now.day:02d}-{now.hour:02d}{now.minute:02d}{now.second:02d}"
+        report_id = f"REP-{property_details.get('id', 'UNK')}-{stamp}"
         
         # Format valuation data
         valuation_data = self.format_valuation_data(valuation_results)
         
+        # Same result as dict | on 3.9+: one fast dict copy, then one update pass
+        property_values = self.DEFAULT_PROPERTY_VALUES.copy()
+        property_values.update(property_details)
+        
         return {
             'company_name': self.company_name,
-            'report_date': datetime.now().strftime("%B %d, %Y"),
+            'report_date': _format_report_date(now.date()),
             'report_id': report_id,
-            'property': {**self.DEFAULT_PROPERTY_VALUES, **property_details},
+            'property': property_values,
             'valuation': valuation_data
         }
 
     def format_valuation_data(self, valuation_results: list) -> dict:
         """Format valuation results for reporting"""
-        primary = valuation_results[0] if isinstance(valuation_results, list) else valuation_results
+        primary = valuation_results[0]
+        primary_value = self.format_currency(primary.value)
         
         return {
             'primary_method': primary.method.replace('_', ' ').title(),
-            'primary_value': self.format_currency(primary.value),
+            'primary_value': primary_value,
             'primary_confidence': f"{int(primary.confidence * 100)}%",
-            'final_value': self.format_currency(primary.value)
+            'final_value': primary_value
         }
 
     def format_currency(self, value: float) -> str:
         """Format currency values consistently"""
-        return "${:,.2f}".format(value) if isinstance(value, (int, float)) else value
+        return f"${value:,.2f}" if isinstance(value, (int, float)) else value
+
+    def _chart_axes(self):
+        """Return the reusable chart figure and axes, creating them on first use"""
+        if self._fig is None:
+            _configure_matplotlib()
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            self._fig = Figure(figsize=(10, 6))
+            FigureCanvasAgg(self._fig)
+            self._ax = self._fig.add_subplot(111)
+            
+            # Static chart furniture is set once; each report only swaps the data artists
+            self._ax.set_xlabel('Comparable Properties')
+            self._ax.set_ylabel('Value (USD)')
+            self._ax.set_title('Sales Comparison Analysis')
+            # Fixed margins for this chart shape; avoids tight_layout's text-measuring pass
+            self._fig.subplots_adjust(left=0.1, right=0.98, top=0.92, bottom=0.12)
+        return self._fig, self._ax
 
-    def generate_comparison_chart(self, valuation_results: list, report_id: str) -> str:
+    def generate_comparison_chart(self, valuation_results: list) -> io.BytesIO:
         """Generate professional comparative analysis chart"""
         try:
-            if not isinstance(valuation_results, list) or not valuation_results:
+            if not valuation_results:
                 return None
                 
             primary = valuation_results[0]
@@ -168,18 +401,28 @@ class ReportGenerator:
                 
             # Prepare chart data
             comp_ids = [f"Comp {i+1}" for i in range(len(comp_data))]
-            sale_prices = [c.get('sale_price', 0) for c in comp_data]
-            adjusted_prices = [a.get('adjusted_price', 0) for a in adjustments]
+            # Prefer the arrays the valuation already built; rebuild them for older results
+            sale_prices = primary.details.get('sale_prices')
+            if sale_prices is None:
+                sale_prices = np.fromiter((getattr(c, 'sale_price', 0) for c in comp_data),
+                                          dtype=np.float64, count=len(comp_data))
+            adjusted_prices = primary.details.get('adjusted_prices')
+            if adjusted_prices is None:
+                adjusted_prices = np.fromiter((a.get('adjusted_price', 0) for a in adjustments),
+                                              dtype=np.float64, count=len(adjustments))
             
             # Create professional chart
-            plt.style.use('seaborn-whitegrid')
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._chart_axes()
+            # Remove the previous report's bars and line instead of resetting the whole axes
+            for artist in [*ax.containers, *ax.lines]:
+                artist.remove()
+            ax.relim()
             
-            x = range(len(comp_ids))
+            x = np.arange(len(comp_ids))
             bar_width = 0.35
             
             ax.bar(x, sale_prices, bar_width, label='Original Price', color='#1f77b4')
-            ax.bar([i + bar_width for i in x], adjusted_prices, bar_width, 
+            ax.bar(x + bar_width, adjusted_prices, bar_width, 
                     label='Adjusted Price', color='#ff7f0e')
             
             # Add property line
@@ -187,21 +430,16 @@ class ReportGenerator:
                         label='Subject Property Value')
             
             # Format chart
-            ax.set_xlabel('Comparable Properties')
-            ax.set_ylabel('Value (USD)')
-            ax.set_title('Sales Comparison Analysis')
-            ax.set_xticks([i + bar_width/2 for i in x])
+            ax.set_xticks(x + bar_width / 2)
             ax.set_xticklabels(comp_ids)
             ax.legend()
-            ax.grid(True, linestyle='--', alpha=0.7)
-            fig.tight_layout()
             
-            # Save chart
-            chart_path = self.output_dir / f"comparison_{report_id}.png"
-            plt.savefig(chart_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            # Render chart to memory at the configured embed resolution
+            buf = io.BytesIO()
+            fig.savefig(buf, format='png', dpi=CHART_DPI)
+            buf.seek(0)
             
-            return str(chart_path)
+            return buf
             
         except Exception as e:
             logger.error(f"Chart generation failed: {str(e)}")
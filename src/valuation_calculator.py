@@ -1,26 +1,74 @@
 import numpy as np
-from dataclasses import dataclass
-from typing import Dict, Optional
+from functools import partial
+from numbers import Real
+from operator import attrgetter
+from typing import Callable, Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Cost and income approach assumptions, shared by the scalar and batch paths
+COST_PER_SQFT = 150
+LAND_VALUE_PER_SQFT = 2
+DEPRECIATION_RATE = 0.1
+MARKET_CAP_RATE = 0.06
+EXPENSE_RATIO = 0.25
+
+# Hybrid valuation blend, kept as an array so the combination is a single dot product
+HYBRID_METHODS = ('sales_comparison', 'income_approach', 'cost_approach')
+HYBRID_WEIGHTS = np.array([0.5, 0.3, 0.2])
+HYBRID_WEIGHT_MAP = dict(zip(HYBRID_METHODS, HYBRID_WEIGHTS.tolist()))
+
+# Comparable rows are namedtuples; one C-level getter fetches the fields the details need
+COMPARABLE_ID_AND_PRICE = attrgetter('id', 'sale_price')
+
+def _field_array(properties: List[Dict], field: str, default=None) -> tuple:
+    """(float64 values, usable mask) for one field; values that aren't real numbers become NaN"""
+    raw = [p.get(field, default) for p in properties]
+    usable = np.fromiter((isinstance(v, Real) for v in raw), dtype=bool, count=len(raw))
+    values = np.fromiter((v if ok else np.nan for v, ok in zip(raw, usable)), dtype=np.float64, count=len(raw))
+    return values, usable
+
 class ValuationResult:
-    method: str
-    value: float
-    confidence: float
-    details: Dict = None
+    __slots__ = ('method', 'value', 'confidence', '_details', '_details_factory')
 
-    def __init__(self, method: str, value: float, confidence: float, details: Dict = None):
+    def __init__(self, method: str, value: float, confidence: float, details: Dict = None,
+                 details_factory: Optional[Callable[[], Dict]] = None):
         self.method = method
         self.value = value
         self.confidence = max(0.0, min(1.0, confidence))
-        self.details = details or {}
+        self._details = None if details_factory else (details or {})
+        self._details_factory = details_factory
+
+    @property
+    def details(self) -> Dict:
+        """Breakdown of the valuation, built on first access when a factory was given"""
+        if self._details is None:
+            self._details = self._details_factory() or {}
+            self._details_factory = None
+        return self._details
+
+    @details.setter
+    def details(self, value: Dict):
+        self._details = value or {}
+        self._details_factory = None
+
+    def __reduce__(self):
+        # Factories close over calculator state, so pickles carry the built details
+        return (ValuationResult, (self.method, self.value, self.confidence, self.details))
+
+    def __repr__(self):
+        return (f"ValuationResult(method={self.method!r}, value={self.value!r}, "
+                f"confidence={self.confidence!r}, details={self.details!r})")
 
 class ValuationCalculator:
     def __init__(self, data_processor):
         self.data_processor = data_processor
+        self._results_cache = {}
+    
+    def clear_cache(self):
+        """Drop memoized valuation results"""
+        self._results_cache.clear()
     
     def calculate_sales_comparison(self, property_details: Dict) -> ValuationResult:
         """Calculate value using sales comparison approach"""
@@ -28,64 +76,41 @@ class ValuationCalculator:
             if not property_details:
                 raise ValueError("No property details provided")
                 
+            # One array per field so the adjustments run as elementwise NumPy ops;
+            # the comparable rows themselves are only fetched if details are read
             property_id = property_details.get('id')
-            comparables = self.data_processor.get_comparable_sales(property_id)
+            columns = self.data_processor.get_comparable_columns(property_id)
             
-            if not comparables:
+            if not columns:
                 raise ValueError("No comparable sales found")
             
-            adjusted_prices = []
-            adjustments = []
+            sale_prices = columns['sale_price']
+            comp_sqft = columns['sqft']
             
-            for comp in comparables:
-                price_per_sqft = comp.get('sale_price', 0) / max(1, comp.get('sqft', 1))
-                
-                size_diff = property_details.get('sqft', 0) - comp.get('sqft', 0)
-                bed_diff = property_details.get('bedrooms', 0) - comp.get('bedrooms', 0)
-                bath_diff = property_details.get('bathrooms', 0) - comp.get('bathrooms', 0)
-                
-                size_adj = size_diff * price_per_sqft * 0.5
-                bed_adj = bed_diff * 10000
-                bath_adj = bath_diff * 7500
-                
-                total_adj = size_adj + bed_adj + bath_adj
-                adjusted_price = comp.get('sale_price', 0) + total_adj
-                
-                adjusted_prices.append(adjusted_price)
-                adjustments.append({
-                    'comp_id': comp.get('id'),
-                    'original_price': comp.get('sale_price'),
-                    'adjustments': {
-                        'size': size_adj,
-                        'bedrooms': bed_adj,
-                        'bathrooms': bath_adj
-                    },
-                    'adjusted_price': adjusted_price
-                })
+            # fmax keeps the old max(1, sqft) behaviour for missing sqft
+            price_per_sqft = sale_prices / np.fmax(comp_sqft, 1.0)
+            size_adj = (property_details.get('sqft', 0) - comp_sqft) * price_per_sqft * 0.5
+            bed_adj = (property_details.get('bedrooms', 0) - columns['bedrooms']) * 10000
+            bath_adj = (property_details.get('bathrooms', 0) - columns['bathrooms']) * 7500
+            adjusted_prices = sale_prices + size_adj + bed_adj + bath_adj
             
-            if not adjusted_prices:
+            if not adjusted_prices.size:
                 raise ValueError("No valid comparable sales after adjustments")
-                
-            avg_value = np.mean(adjusted_prices)
-            std_dev = np.std(adjusted_prices)
+            
+            count = adjusted_prices.size
+            avg_value = adjusted_prices.sum() / count
+            deviations = adjusted_prices - avg_value
+            std_dev = np.sqrt(deviations @ deviations / count)
             confidence = min(1.0, max(0.5, 1 - (std_dev / avg_value))) if avg_value != 0 else 0.5
             
+            # The per-comparable breakdown is only built if someone reads result.details
             return ValuationResult(
                 method="sales_comparison",
                 value=round(avg_value, 2),
                 confidence=round(confidence, 2),
-                details={
-                    'comparables': comparables,
-                    'adjustments': adjustments,
-                    'statistics': {
-                        'mean': round(avg_value, 2),
-                        'median': round(np.median(adjusted_prices), 2),
-                        'std_dev': round(std_dev, 2),
-                        'min': round(min(adjusted_prices), 2),
-                        'max': round(max(adjusted_prices), 2),
-                        'count': len(adjusted_prices)
-                    }
-                }
+                details_factory=partial(
+                    self._sales_comparison_details, property_id, sale_prices,
+                    size_adj, bed_adj, bath_adj, adjusted_prices, avg_value, std_dev)
             )
             
         except Exception as e:
@@ -97,6 +122,50 @@ class ValuationCalculator:
                 details={'error': str(e)}
             )
 
+    @staticmethod
+    def _build_sales_comparison_details(comparables, sale_prices, size_adj, bed_adj, bath_adj,
+                                        adjusted_prices, avg_value, std_dev) -> Dict:
+        """Assemble the per-comparable adjustments and summary statistics"""
+        adjustments = [
+            {
+                'comp_id': comp_id,
+                'original_price': original_price,
+                'adjustments': {
+                    'size': size,
+                    'bedrooms': bed,
+                    'bathrooms': bath
+                },
+                'adjusted_price': adjusted
+            }
+            for (comp_id, original_price), size, bed, bath, adjusted in zip(
+                map(COMPARABLE_ID_AND_PRICE, comparables), size_adj.tolist(), bed_adj.tolist(),
+                bath_adj.tolist(), adjusted_prices.tolist())
+        ]
+        
+        # A single partition places min, median and max instead of separate passes
+        count = adjusted_prices.size
+        lower, upper = (count - 1) // 2, count // 2
+        ordered = np.partition(adjusted_prices, (0, lower, upper, count - 1))
+        minimum, median = ordered[0], (ordered[lower] + ordered[upper]) / 2
+        if np.isnan(ordered[-1]):
+            # NaNs partition to the end; like np.min/np.median, any NaN propagates
+            minimum = median = np.nan
+        
+        return {
+            'comparables': comparables,
+            'adjustments': adjustments,
+            'sale_prices': sale_prices,
+            'adjusted_prices': adjusted_prices,
+            'statistics': {
+                'mean': round(avg_value, 2),
+                'median': round(median, 2),
+                'std_dev': round(std_dev, 2),
+                'min': round(minimum, 2),
+                'max': round(ordered[-1], 2),
+                'count': count
+            }
+        }
+    
     def calculate_income_approach(self, property_details: Dict) -> ValuationResult:
         """Calculate value using income capitalization approach"""
         try:
@@ -107,8 +176,8 @@ class ValuationCalculator:
             if annual_rent is None:
                 raise ValueError("Annual rent data missing")
             
-            market_cap_rate = 0.06
-            noi = annual_rent * 0.75
+            market_cap_rate = MARKET_CAP_RATE
+            noi = annual_rent * (1 - EXPENSE_RATIO)
             value = noi / market_cap_rate
             
             return ValuationResult(
@@ -119,7 +188,7 @@ class ValuationCalculator:
                     'noi': round(noi, 2),
                     'cap_rate': market_cap_rate,
                     'annual_rent': annual_rent,
-                    'expense_ratio': 0.25
+                    'expense_ratio': EXPENSE_RATIO
                 }
             )
             
@@ -141,11 +210,11 @@ class ValuationCalculator:
             sqft = property_details.get('sqft', 0)
             lot_size = property_details.get('lot_size', 0)
             
-            cost_per_sqft = 150
-            land_value_per_sqft = 2
+            cost_per_sqft = COST_PER_SQFT
+            land_value_per_sqft = LAND_VALUE_PER_SQFT
             
             building_value = sqft * cost_per_sqft
-            depreciation = building_value * 0.1
+            depreciation = building_value * DEPRECIATION_RATE
             land_value = lot_size * land_value_per_sqft
             value = land_value + building_value - depreciation
             
@@ -171,42 +240,39 @@ class ValuationCalculator:
                 details={'error': str(e)}
             )
 
+    def calculate_income_approach_batch(self, properties: List[Dict]) -> np.ndarray:
+        """Income approach values for many properties at once; NaN where the scalar path would fail"""
+        annual_rent, _ = _field_array(properties, 'annual_rent')
+        return np.round(annual_rent * (1 - EXPENSE_RATIO) / MARKET_CAP_RATE, 2)
+
+    def calculate_cost_approach_batch(self, properties: List[Dict]) -> np.ndarray:
+        """Cost approach values for many properties at once; NaN where the scalar path would fail"""
+        sqft, sqft_ok = _field_array(properties, 'sqft', 0)
+        lot_size, lot_ok = _field_array(properties, 'lot_size', 0)
+        
+        building_value = sqft * COST_PER_SQFT
+        value = lot_size * LAND_VALUE_PER_SQFT + building_value - building_value * DEPRECIATION_RATE
+        value[~(sqft_ok & lot_ok)] = np.nan
+        return np.round(value, 2)
+
     def calculate_hybrid_valuation(self, property_details: Dict) -> ValuationResult:
         """Calculate hybrid valuation combining multiple methods"""
         try:
-            sales_comp = self.calculate_sales_comparison(property_details)
-            income = self.calculate_income_approach(property_details)
-            cost = self.calculate_cost_approach(property_details)
-            
-            weights = {
-                'sales_comparison': 0.5,
-                'income_approach': 0.3,
-                'cost_approach': 0.2
-            }
+            results = [self.calculate_valuation(property_details, method) for method in HYBRID_METHODS]
             
-            weighted_value = (
-                sales_comp.value * weights['sales_comparison'] +
-                income.value * weights['income_approach'] +
-                cost.value * weights['cost_approach']
-            )
-            
-            weighted_confidence = (
-                sales_comp.confidence * weights['sales_comparison'] +
-                income.confidence * weights['income_approach'] +
-                cost.confidence * weights['cost_approach']
-            )
+            weighted_value = float(np.array([r.value for r in results], dtype=np.float64) @ HYBRID_WEIGHTS)
+            weighted_confidence = float(np.array([r.confidence for r in results], dtype=np.float64) @ HYBRID_WEIGHTS)
             
             return ValuationResult(
                 method="hybrid",
                 value=round(weighted_value, 2),
                 confidence=round(weighted_confidence, 2),
-                details={
+                details_factory=lambda: {
                     'components': {
-                        'sales_comparison': sales_comp.details,
-                        'income_approach': income.details,
-                        'cost_approach': cost.details
+                        method: result.details
+                        for method, result in zip(HYBRID_METHODS, results)
                     },
-                    'weights': weights
+                    'weights': dict(HYBRID_WEIGHT_MAP)
                 }
             )
             
@@ -220,6 +286,146 @@ class ValuationCalculator:
             )
 
     def calculate_valuation(self, property_details: Dict, method: str = "hybrid") -> ValuationResult:
+        """Calculate property valuation, memoized per (property_id, method)"""
+        property_id = property_details.get('id') if property_details else None
+        if property_id is None:
+            return self._calculate_valuation(property_details, method)
+            
+        key = (getattr(self.data_processor, 'data_version', None), str(property_id), method)
+        if key not in self._results_cache:
+            self._results_cache[key] = self._calculate_valuation(property_details, method)
+        return self._results_cache[key]
+
+    def calculate_valuations_batch(self, property_ids: List, method: str = "hybrid") -> List[ValuationResult]:
+        """Value many properties at once, running the sales comparison over concatenated comparables"""
+        property_ids = [str(property_id).strip() for property_id in property_ids]
+        try:
+            if method not in HYBRID_METHODS + ('hybrid',):
+                raise ValueError(f"Unknown valuation method: {method}")
+            
+            subjects = self.data_processor.get_properties_bulk(property_ids)
+            properties = subjects.to_dict('records')
+            found_ids = [str(p.get('id')) for p in properties]
+            
+            if method in ('income_approach', 'cost_approach'):
+                results = [self.calculate_valuation(p, method) for p in properties]
+            else:
+                results = self._sales_comparison_batch(found_ids, subjects)
+                if method == 'hybrid':
+                    results = self._hybrid_batch(properties, results)
+            
+            by_id = dict(zip(found_ids, results))
+            return [
+                by_id.get(property_id) or ValuationResult(
+                    method=method, value=0, confidence=0,
+                    details={'error': f"No property found with ID: {property_id}"})
+                for property_id in property_ids
+            ]
+            
+        except Exception as e:
+            logger.error(f"Batch valuation failed: {str(e)}")
+            return [ValuationResult(method=method, value=0, confidence=0, details={'error': str(e)})
+                    for _ in property_ids]
+
+    def _sales_comparison_batch(self, property_ids: List[str], subjects) -> List[ValuationResult]:
+        """Sales comparison for many subjects; comparables are ragged runs delimited by counts"""
+        comps = self.data_processor.get_comparables_bulk(property_ids)
+        counts = comps['counts']
+        
+        def subject_column(col: str) -> np.ndarray:
+            if col not in subjects.columns:
+                return np.zeros(len(subjects))
+            return np.repeat(subjects[col].to_numpy(dtype=np.float64, na_value=np.nan), counts)
+        
+        sale_prices = comps['sale_price']
+        price_per_sqft = sale_prices / np.fmax(comps['sqft'], 1.0)
+        size_adj = (subject_column('sqft') - comps['sqft']) * price_per_sqft * 0.5
+        bed_adj = (subject_column('bedrooms') - comps['bedrooms']) * 10000
+        bath_adj = (subject_column('bathrooms') - comps['bathrooms']) * 7500
+        adjusted_prices = sale_prices + size_adj + bed_adj + bath_adj
+        
+        # reduceat needs strictly increasing starts, so only subjects with comparables take part
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        has_comps = counts > 0
+        sums = np.zeros(len(counts))
+        squares = np.zeros(len(counts))
+        if adjusted_prices.size:
+            sums[has_comps] = np.add.reduceat(adjusted_prices, starts[has_comps])
+        means = sums / np.maximum(counts, 1)
+        deviations = adjusted_prices - np.repeat(means, counts)
+        if adjusted_prices.size:
+            squares[has_comps] = np.add.reduceat(deviations * deviations, starts[has_comps])
+        std_devs = np.sqrt(squares / np.maximum(counts, 1))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            confidences = np.clip(1 - std_devs / means, 0.5, 1.0)
+        confidences[(means == 0) | np.isnan(confidences)] = 0.5
+        
+        results = []
+        for i, property_id in enumerate(property_ids):
+            if not has_comps[i]:
+                results.append(ValuationResult(
+                    method="sales_comparison", value=0, confidence=0,
+                    details={'error': "No comparable sales found"}))
+                continue
+            run = slice(starts[i], ends[i])
+            results.append(ValuationResult(
+                method="sales_comparison",
+                value=round(means[i], 2),
+                confidence=round(confidences[i], 2),
+                details_factory=partial(
+                    self._sales_comparison_details, property_id, sale_prices[run], size_adj[run],
+                    bed_adj[run], bath_adj[run], adjusted_prices[run], means[i], std_devs[i])
+            ))
+        return results
+
+    def _sales_comparison_details(self, property_id, *arrays) -> Dict:
+        """Sales comparison details for one subject, fetching its comparable rows on demand"""
+        comparables = self.data_processor.get_comparable_sales(property_id)
+        return self._build_sales_comparison_details(comparables, *arrays)
+
+    def _hybrid_batch(self, properties: List[Dict], sales_results: List[ValuationResult]) -> List[ValuationResult]:
+        """Blend batch sales comparison results with the array income and cost approaches"""
+        # Same success rules as the scalar methods: a non-numeric input is an error result
+        # (value 0, confidence 0), while NaN inputs give NaN values at full confidence
+        _, income_ok = _field_array(properties, 'annual_rent')
+        _, sqft_ok = _field_array(properties, 'sqft', 0)
+        _, lot_ok = _field_array(properties, 'lot_size', 0)
+        cost_ok = sqft_ok & lot_ok
+        values = np.column_stack([
+            [r.value for r in sales_results],
+            np.where(income_ok, self.calculate_income_approach_batch(properties), 0.0),
+            np.where(cost_ok, self.calculate_cost_approach_batch(properties), 0.0)
+        ]) @ HYBRID_WEIGHTS
+        confidences = np.column_stack([
+            [r.confidence for r in sales_results],
+            np.where(income_ok, 0.7, 0.0),
+            np.where(cost_ok, 0.6, 0.0)
+        ]) @ HYBRID_WEIGHTS
+        
+        return [
+            ValuationResult(
+                method="hybrid",
+                value=round(value, 2),
+                confidence=round(confidence, 2),
+                details_factory=partial(self._batch_hybrid_details, prop, sales)
+            )
+            for prop, sales, value, confidence in zip(properties, sales_results, values.tolist(), confidences.tolist())
+        ]
+
+    def _batch_hybrid_details(self, property_details: Dict, sales_result: ValuationResult) -> Dict:
+        """Hybrid details for one subject of a batch, with the scalar income and cost breakdowns"""
+        return {
+            'components': {
+                'sales_comparison': sales_result.details,
+                'income_approach': self.calculate_income_approach(property_details).details,
+                'cost_approach': self.calculate_cost_approach(property_details).details
+            },
+            'weights': dict(HYBRID_WEIGHT_MAP)
+        }
+
+    def _calculate_valuation(self, property_details: Dict, method: str) -> ValuationResult:
         """Calculate property valuation using specified method"""
         try:
             if not property_details:
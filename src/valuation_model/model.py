@@ -1,14 +1,28 @@
+import numpy as np
 import pandas as pd
-import pickle
+import joblib
+from itertools import chain
+from operator import itemgetter
 from pathlib import Path
-from sklearn.ensemble import RandomForestRegressor
-from typing import Dict, Union, Optional
+from sklearn.ensemble import HistGradientBoostingRegressor
+from typing import Dict, List, Union, Optional
 import logging
+import threading
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+MODEL_FEATURES = (
+    'bedrooms',
+    'bathrooms',
+    'square_footage',
+    'lot_size',
+    'year_built',
+    'location_score'
+)
+# Fetches every feature in one C-level call when the input carries all of them
+_feature_getter = itemgetter(*MODEL_FEATURES)
+_feature_defaults = dict.fromkeys(MODEL_FEATURES, 0)
+
 class ValuationModel:
     def __init__(self, model_path: Optional[str] = None):
         """
@@ -18,14 +32,7 @@ class ValuationModel:
             model_path: Optional path to pretrained model file
         """
         self.model = None
-        self.features = [
-            'bedrooms',
-            'bathrooms',
-            'square_footage', 
-            'lot_size',
-            'year_built',
-            'location_score'
-        ]
+        self.features = list(MODEL_FEATURES)
         self._initialize_model(model_path)
 
     def _initialize_model(self, model_path: Optional[str]):
@@ -68,8 +75,8 @@ class ValuationModel:
                 logger.warning(f"Model file too small: {model_path}")
                 return False
                 
-            with open(model_path, 'rb') as f:
-                self.model = pickle.load(f)
+            # joblib also reads models saved as plain pickles
+            self.model = joblib.load(model_path)
                 
             logger.info(f"Successfully loaded model from {model_path}")
             return True
@@ -80,13 +87,13 @@ class ValuationModel:
 
     def _initialize_fallback_model(self):
         """Initialize a new model as fallback"""
-        logger.info("Initializing new RandomForest model")
-        self.model = RandomForestRegressor(
-            n_estimators=150,
-            max_depth=10,
-            min_samples_split=5,
-            random_state=42,
-            verbose=1
+        logger.info("Initializing new gradient boosting model")
+        # Histogram-binned splits predict much faster than a deep RandomForest and serialize smaller
+        self.model = HistGradientBoostingRegressor(
+            max_iter=300,
+            max_leaf_nodes=63,
+            learning_rate=0.05,
+            random_state=42
         )
         logger.info("New model initialized. Requires training before use.")
 
@@ -100,19 +107,40 @@ class ValuationModel:
         Returns:
             Predicted value (float) or None if prediction fails
         """
+        if isinstance(property_data, pd.DataFrame):
+            predictions = self.predict_valuations(property_data.iloc[:1])
+        else:
+            predictions = self.predict_valuations([property_data])
+        return None if predictions is None else float(predictions[0])
+
+    def predict_valuations(self, properties: Union[List[Dict], pd.DataFrame]) -> Optional[np.ndarray]:
+        """
+        Predict valuations for many properties with a single model call
+        
+        Args:
+            properties: List of property feature dicts, or a DataFrame with one row per property
+            
+        Returns:
+            Array of predicted values or None if prediction fails
+        """
         try:
             if not hasattr(self.model, 'predict'):
                 raise ValueError("Model not properly initialized")
                 
-            features = self._prepare_features(property_data)
-            prediction = self.model.predict([features])[0]
-            return round(float(prediction), 2)
+            if isinstance(properties, pd.DataFrame):
+                features = properties.reindex(columns=self.features).fillna(0).to_numpy(dtype=np.float64)
+            else:
+                values = chain.from_iterable(map(self._feature_values, properties))
+                features = np.fromiter(values, dtype=np.float64).reshape(-1, len(MODEL_FEATURES))
+                # None and NaN become NaN above; fill them like the DataFrame path's fillna(0)
+                features[np.isnan(features)] = 0
+            return np.round(self.model.predict(features), 2)
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             return None
 
-    def _prepare_features(self, property_data: Union[Dict, pd.DataFrame]) -> list:
+    def _prepare_features(self, property_data: Union[Dict, pd.DataFrame]) -> np.ndarray:
         """
         Prepare input features for prediction
         
@@ -120,19 +148,22 @@ class ValuationModel:
             property_data: Input data to convert
             
         Returns:
-            list: Prepared feature values
+            np.ndarray: Prepared feature values
         """
         if isinstance(property_data, pd.DataFrame):
             property_data = property_data.iloc[0].to_dict()
             
-        return [
-            float(property_data.get('bedrooms', 0)),
-            float(property_data.get('bathrooms', 0)),
-            float(property_data.get('square_footage', 0)),
-            float(property_data.get('lot_size', 0)),
-            float(property_data.get('year_built', 0)),
-            float(property_data.get('location_score', 0))
-        ]
+        features = np.fromiter(self._feature_values(property_data), dtype=np.float64, count=len(MODEL_FEATURES))
+        features[np.isnan(features)] = 0
+        return features
+
+    @staticmethod
+    def _feature_values(property_data: Dict) -> tuple:
+        """Feature values in model order, defaulting missing ones to 0"""
+        try:
+            return _feature_getter(property_data)
+        except KeyError:
+            return _feature_getter({**_feature_defaults, **property_data})
 
     def train_model(self, training_data: pd.DataFrame, save_path: Optional[str] = None) -> bool:
         """
@@ -170,16 +201,26 @@ class ValuationModel:
     def _save_model(self, save_path: str):
         """Internal method to save model with error handling"""
         try:
-            with open(save_path, 'wb') as f:
-                pickle.dump(self.model, f)
+            # joblib stores the tree arrays as raw NumPy buffers instead of pickling them element by element
+            joblib.dump(self.model, save_path, compress=3)
             logger.info(f"Model saved to {save_path}")
         except Exception as e:
             logger.error(f"Failed to save model: {str(e)}")
             raise
 
 
-# Singleton instance for application-wide access
-valuation_model = ValuationModel()
+# Singleton instance for application-wide access, loaded on first use rather than at import
+_model_lock = threading.Lock()
+_valuation_model = None
+
+def get_valuation_model() -> ValuationModel:
+    """Return the shared model, loading it once in a thread-safe way"""
+    global _valuation_model
+    if _valuation_model is None:
+        with _model_lock:
+            if _valuation_model is None:
+                _valuation_model = ValuationModel()
+    return _valuation_model
 
 def predict_valuation(property_data: Union[Dict, pd.DataFrame]) -> Optional[float]:
     """
@@ -191,4 +232,4 @@ def predict_valuation(property_data: Union[Dict, pd.DataFrame]) -> Optional[floa
     Returns:
         Predicted valuation or None if prediction fails
     """
-    return valuation_model.predict_valuation(property_data)
\ No newline at end of file
+    return get_valuation_model().predict_valuation(property_data)
\ No newline at end of file
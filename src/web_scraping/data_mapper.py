@@ -1,3 +1,14 @@
+import pandas as pd
+
+# Scraped field -> model column
+COLUMN_MAP = {
+    'address': 'Address',
+    'bedrooms': 'Bedrooms',
+    'bathrooms': 'Bathrooms',
+    'sqft': 'SquareFootage',
+    'lot_size': 'LotSize'
+}
+
 def map_to_model(scraped_data, source):
     return {
         'Address': scraped_data['address'],
@@ -6,4 +17,10 @@ def map_to_model(scraped_data, source):
         'SquareFootage': scraped_data['sqft'],
         'LotSize': scraped_data['lot_size'],
         'DataSource': source
-    }
\ No newline at end of file
+    }
+
+def map_many(records, source):
+    """Map many scraped records at once into a model-shaped DataFrame"""
+    frame = pd.DataFrame.from_records(records, columns=list(COLUMN_MAP)).rename(columns=COLUMN_MAP)
+    frame['DataSource'] = source
+    return frame
@@ -1,10 +1,25 @@
 import requests
+from requests.adapters import HTTPAdapter
 import random
 import time
+import itertools
+import re
 from src.config import PROXY_SETTINGS
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 
+# orjson parses the proxy API payloads straight from bytes when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# free-proxy-list.net rows: IP, port, four informational cells, then the HTTPS flag
+FREEPROXY_ROW_RE = re.compile(
+    r"<tr>\s*<td>(\d{1,3}(?:\.\d{1,3}){3})</td>\s*<td>(\d+)</td>"
+    r"(?:\s*<td[^>]*>[^<]*</td>){4}\s*<td[^>]*>yes</td>"
+)
+
 class FreeProxyManager:
     """
     A class to manage free proxies for web scraping with automatic:
@@ -21,20 +36,33 @@ class FreeProxyManager:
             self._get_freeproxy_proxies
         ]
         self.working_proxies = []
+        self._cursor = None
         self.max_proxies = max_proxies
         self.verify_ssl = verify_ssl
         self.last_refresh = 0
-        self.refresh_interval = 3600  # 1 hour
+        self.refresh_interval = PROXY_SETTINGS.get('refresh_interval', 3600)
+        self.test_workers = 50
+        self._dead_proxies = {}  # proxy -> time it last failed a test
+        self.dead_proxy_ttl = 86400  # skip failed proxies for a day
+        
+        # One pooled keep-alive session for source fetches and proxy tests
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=100, pool_maxsize=100)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
         
     def get_proxy(self) -> Optional[Dict[str, str]]:
-        """Get a random working proxy"""
+        """Get the next working proxy in the shuffled rotation"""
+        if not PROXY_SETTINGS.get('enabled', True):
+            return None
+            
         if not self.working_proxies or time.time() - self.last_refresh > self.refresh_interval:
             self.refresh_proxies()
             
         if not self.working_proxies:
             return None
             
-        return random.choice(self.working_proxies)
+        return next(self._cursor)
     
     def refresh_proxies(self) -> None:
         """Refresh the list of working proxies"""
@@ -47,15 +75,38 @@ class FreeProxyManager:
             for proxy_list in results:
                 raw_proxies.update(proxy_list)
         
-        # Test proxies in parallel
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            test_results = executor.map(self._test_proxy, raw_proxies)
+        # Most proxies listed again after an hour are the same dead ones, so skip recent failures
+        now = time.time()
+        self._dead_proxies = {
+            proxy: failed_at for proxy, failed_at in self._dead_proxies.items()
+            if now - failed_at < self.dead_proxy_ttl
+        }
+        raw_proxies.difference_update(self._dead_proxies)
+        
+        # Testing is network-bound: run a wide fan-out and stop once max_proxies have passed
+        working = []
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.test_workers, len(raw_proxies))))
+        futures = {executor.submit(self._test_proxy, proxy): proxy for proxy in raw_proxies}
+        try:
+            for future in as_completed(futures):
+                if not future.result():
+                    self._dead_proxies[futures[future]] = now
+                    continue
+                working.append(futures[future])
+                if len(working) >= self.max_proxies:
+                    break
+        finally:
+            # Drop queued checks and return without joining the in-flight ones; they finish
+            # within the request timeout in the background (cancel_futures needs Python 3.9)
+            for pending in futures:
+                pending.cancel()
+            executor.shutdown(wait=False)
             
-        self.working_proxies = [
-            {"http": proxy, "https": proxy} 
-            for proxy, is_working in zip(raw_proxies, test_results) 
-            if is_working
-        ][:self.max_proxies]
+        self.working_proxies = [{"http": proxy, "https": proxy} for proxy in working]
+        
+        # Shuffle once per refresh, then hand proxies out round-robin without an RNG call each time
+        random.shuffle(self.working_proxies)
+        self._cursor = itertools.cycle(self.working_proxies)
         
         self.last_refresh = time.time()
         print(f"Found {len(self.working_proxies)} working proxies")
@@ -63,7 +114,7 @@ class FreeProxyManager:
     def _test_proxy(self, proxy: str) -> bool:
         """Test if a proxy is working"""
         try:
-            response = requests.get(
+            response = self._session.get(
                 "http://httpbin.org/ip",
                 proxies={"http": proxy, "https": proxy},
                 timeout=5,
@@ -78,10 +129,10 @@ class FreeProxyManager:
         """Fetch proxies from Geonode API"""
         try:
             url = "https://proxylist.geonode.com/api/proxy-list?limit=50&page=1&sort_by=lastChecked&sort_type=desc"
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             return [
                 f"http://{p['ip']}:{p['port']}"
-                for p in response.json().get('data', [])
+                for p in json_loads(response.content).get('data', [])
                 if p.get('protocols', ['http']) and 'http' in p['protocols']
             ]
         except:
@@ -91,7 +142,7 @@ class FreeProxyManager:
         """Fetch proxies from ProxyScrape"""
         try:
             url = "https://api.proxyscrape.com/v2/?request=getproxies&protocol=http&timeout=5000&country=all"
-            response = requests.get(url, timeout=10)
+            response = self._session.get(url, timeout=10)
             return [
                 f"http://{line.strip()}"
                 for line in response.text.split('\n')
@@ -104,35 +155,16 @@ class FreeProxyManager:
         """Fetch proxies from FreeProxyList"""
         try:
             url = "https://free-proxy-list.net/"
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            proxies = []
-            
-            for row in soup.select('table#proxylisttable tbody tr'):
-                cols = row.find_all('td')
-                if cols[6].text == 'yes':  # HTTPS support
-                    proxy = f"http://{cols[0].text}:{cols[1].text}"
-                    proxies.append(proxy)
-            return proxies
+            response = self._session.get(url, timeout=10)
+            # A regex over the raw table avoids building a DOM for hundreds of rows
+            return [
+                f"http://{ip}:{port}"
+                for ip, port in FREEPROXY_ROW_RE.findall(response.text)
+            ]
         except:
             return []
 
 # Singleton instance for easy access
-class ProxyManager:
-    def __init__(self):
-        self.proxies = []
-        self.last_refresh = 0
-        
-    def get_proxy(self):
-        if not PROXY_SETTINGS['enabled']:
-            return None
-            
-        if (time.time() - self.last_refresh > PROXY_SETTINGS['refresh_interval'] 
-            or not self.proxies):
-            self.refresh_proxies()
-            
-        return random.choice(self.proxies) if self.proxies else None
-    
 proxy_manager = FreeProxyManager()
 
 def get_proxy() -> Optional[Dict[str, str]]:
@@ -1,16 +1,108 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 from bs4 import BeautifulSoup
+import atexit
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from fake_useragent import UserAgent
 import json
-from typing import Dict, Optional
+import re
+import hashlib
+from pathlib import Path
+from html import unescape
+from types import MappingProxyType
+from typing import Dict, List, Optional
+from src.config import SCRAPE_CACHE_DIR, ensure_dir
+
+# orjson decodes the JSON-LD payload straight from bytes when it is installed
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+# The listing data lives in one JSON-LD script; these find it without building a DOM
+JSONLD_RE = re.compile(rb'<script[^>]+type="application/ld\+json"[^>]*>(.*?)</script>', re.DOTALL)
+ZESTIMATE_RE = re.compile(rb'<span[^>]+data-testid="zestimate"[^>]*>([^<]*)</span>')
+CAPTCHA_RE = re.compile(rb'captcha', re.IGNORECASE)
+
+# One keep-alive session for every scraper instance; transient HTTP failures are
+# retried by urllib3 with backoff, so the fetch loop below only handles blocks
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+atexit.register(SESSION.close)
+
+# Shared read-only default for nested JSON-LD lookups, instead of a new {} per .get()
+EMPTY = MappingProxyType({})
+
+class PageCache:
+    """On-disk copy of fetched pages with their validators, for conditional GETs"""
+    
+    def __init__(self, directory: Path):
+        self.directory = directory
+        
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return self.directory / f"{key}.html", self.directory / f"{key}.json"
+        
+    def validators(self, url: str) -> Optional[Dict[str, str]]:
+        """If-None-Match / If-Modified-Since headers for a cached page, if any"""
+        try:
+            return json.loads(self._paths(url)[1].read_bytes())
+        except (OSError, ValueError):
+            return None
+            
+    def load(self, url: str) -> Optional[bytes]:
+        try:
+            return self._paths(url)[0].read_bytes()
+        except OSError:
+            return None
+            
+    def discard(self, url: str) -> None:
+        """Forget a cached page and its validators"""
+        for path in self._paths(url):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            
+    def store(self, url: str, response) -> None:
+        """Keep the page when the server sent validators to revalidate it with"""
+        if response.status_code != 200:
+            return
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        if not validators:
+            return
+        try:
+            ensure_dir(self.directory)
+            body_path, meta_path = self._paths(url)
+            body_path.write_bytes(response.content)
+            # The validators are written last so they never point at a missing body
+            meta_path.write_text(json.dumps(validators))
+        except OSError as e:
+            print(f"Could not cache page {url}: {e}")
+
+PAGE_CACHE = PageCache(SCRAPE_CACHE_DIR)
+
+# Loading the user-agent database is the slow part of UserAgent(), so do it once per process
+USER_AGENT = UserAgent()
 
 class ZillowScraper:
     def __init__(self):
         self.base_url = "https://www.zillow.com"
-        self.session = requests.Session()
-        self.user_agent = UserAgent()
+        self.session = SESSION
+        self.user_agent = USER_AGENT
         self.headers = {
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
@@ -18,32 +110,61 @@ class ZillowScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
         }
+        
+        # Draw user agents from a fixed pool; each request gets its own copy of the headers
+        browsers = getattr(self.user_agent, 'data_browsers', None)
+        if browsers:
+            self._ua_pool = tuple(browser['useragent'] for browser in browsers)
+        else:
+            self._ua_pool = tuple(self.user_agent.random for _ in range(50))
+        self._base_headers = {**self.headers, 'Referer': f'{self.base_url}/'}
 
     def _get_random_headers(self) -> Dict:
         """Generate random headers to avoid bot detection"""
-        return {
-            **self.headers,
-            'User-Agent': self.user_agent.random,
-            'Referer': f'{self.base_url}/'
-        }
+        # A fresh dict per call: scrape_properties sends requests from many threads at once
+        return {**self._base_headers, 'User-Agent': random.choice(self._ua_pool)}
 
-    def _get_property_soup(self, url: str) -> Optional[BeautifulSoup]:
-        """Fetch and parse HTML with retries"""
+    def _get_property_page(self, url: str) -> Optional[bytes]:
+        """Fetch the raw listing HTML with retries, revalidating cached copies"""
         for _ in range(3):  # Retry 3 times
             try:
+                headers = self._get_random_headers()
+                validators = PAGE_CACHE.validators(url)
+                if validators:
+                    headers = {**headers, **validators}
+                    
                 response = self.session.get(
                     url,
-                    headers=self._get_random_headers(),
+                    headers=headers,
                     timeout=10
                 )
+                
+                # Unchanged listing: the server skipped the body, reuse the stored page
+                if response.status_code == 304:
+                    cached = PAGE_CACHE.load(url)
+                    if cached is not None:
+                        return cached
+                    # Validators without a body are a cache miss: drop them and fetch in full
+                    PAGE_CACHE.discard(url)
+                    continue
+                        
                 response.raise_for_status()
                 
-                # Check if blocked
-                if "captcha" in response.text.lower():
+                # Check if blocked, scanning the bytes without a lowercased copy of the page
+                if CAPTCHA_RE.search(response.content):
                     raise ValueError("CAPTCHA encountered")
                     
-                return BeautifulSoup(response.text, 'html.parser')
+                PAGE_CACHE.store(url, response)
+                return response.content
                 
+            except requests.HTTPError as e:
+                # Blocked responses (403 and other 4xx) fall outside the urllib3 Retry policy,
+                # so back off and retry with a freshly rotated User-Agent as before
+                print(f"Retrying... Error: {e}")
+                time.sleep(random.uniform(2, 5))
+            except requests.RequestException as e:
+                print(f"Request failed: {e}")
+                return None
             except Exception as e:
                 print(f"Retrying... Error: {e}")
                 time.sleep(random.uniform(2, 5))
@@ -51,27 +172,29 @@ class ZillowScraper:
 
     def scrape_property(self, zillow_url: str) -> Optional[Dict]:
         """Extract property data from Zillow URL"""
-        soup = self._get_property_soup(zillow_url)
-        if not soup:
+        page = self._get_property_page(zillow_url)
+        if not page:
             return None
 
         try:
-            # Extract from JSON-LD (most reliable)
-            script = soup.find('script', type='application/ld+json')
+            # Extract from JSON-LD (most reliable) straight from the raw page
+            script = JSONLD_RE.search(page)
             if script:
-                data = json.loads(script.string)
+                data = json_loads(script.group(1))
+                zestimate = ZESTIMATE_RE.search(page)
                 return {
-                    'address': data.get('address', {}).get('streetAddress'),
-                    'price': data.get('offers', {}).get('price'),
+                    'address': data.get('address', EMPTY).get('streetAddress'),
+                    'price': data.get('offers', EMPTY).get('price'),
                     'bedrooms': data.get('numberOfBedrooms'),
                     'bathrooms': data.get('numberOfBathrooms'),
-                    'sqft': data.get('floorSize', {}).get('value'),
-                    'lot_size': data.get('lotSize', {}).get('value'),
+                    'sqft': data.get('floorSize', EMPTY).get('value'),
+                    'lot_size': data.get('lotSize', EMPTY).get('value'),
                     'year_built': data.get('yearBuilt'),
-                    'zestimate': soup.find('span', {'data-testid': 'zestimate'}).text.strip() if soup.find('span', {'data-testid': 'zestimate'}) else None
+                    'zestimate': unescape(zestimate.group(1).decode()).strip() if zestimate else None
                 }
 
-            # Fallback to HTML scraping
+            # Fallback to HTML scraping; lxml's C parser detects the encoding itself
+            soup = BeautifulSoup(page, 'lxml')
             return {
                 'address': soup.find('h1', {'data-testid': 'address'}).text.strip(),
                 'price': soup.find('span', {'data-testid': 'price'}).text.strip().replace('$', '').replace(',', ''),
@@ -85,6 +208,13 @@ class ZillowScraper:
             print(f"Scraping failed: {e}")
             return None
 
+    def scrape_properties(self, zillow_urls: List[str], max_workers: int = 20) -> List[Optional[Dict]]:
+        """Scrape several listings concurrently over the shared connection pool"""
+        if not zillow_urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(zillow_urls))) as executor:
+            return list(executor.map(self.scrape_property, zillow_urls))
+
 if __name__ == "__main__":
     scraper = ZillowScraper()
     
@@ -1,44 +1,203 @@
 # src/web_scraping/zillow_scraper.py
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+import soupsieve as sv
 import re
-import time
+import json
+import math
+import atexit
+import queue
 import logging
-from fake_useragent import UserAgent
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from .scrapers import SESSION, CAPTCHA_RE, USER_AGENT
 
 logger = logging.getLogger(__name__)
 
+# Only the DOM text is scraped, so images, fonts, styles and trackers are never fetched
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg",
+    "*.woff", "*.woff2", "*.ttf", "*.css",
+    "*analytics*", "*doubleclick*"
+]
+
+# Either element means the listing facts have rendered
+LISTING_READY = (By.CSS_SELECTOR, 'h1[data-testid="address"], span[data-testid="price"]')
+
+# Field selectors compiled once instead of re-parsed by soupsieve on every select_one
+ADDRESS_SELECTOR = sv.compile('h1[data-testid="address"]')
+PRICE_SELECTOR = sv.compile('span[data-testid="price"]')
+BEDROOMS_SELECTOR = sv.compile('span[data-testid="bedrooms"]')
+BATHROOMS_SELECTOR = sv.compile('span[data-testid="bathrooms"]')
+SQFT_SELECTOR = sv.compile('span[data-testid="floor-space"]')
+
+# Lot size and year built are read from the facts panel rather than the whole page
+FACTS_SELECTOR = sv.compile('[data-testid="facts-container"], ul.dpf__sc-1yuq444-0')
+LOT_ACRES_RE = re.compile(r'(\d+\.?\d*)\s*acres?')
+LOT_SQFT_RE = re.compile(r'(\d+,\d+|\d+)\s*sq\.?\s*ft\.?')
+BUILT_RE = re.compile(r'Built')
+YEAR_RE = re.compile(r'\d{4}')
+
+# Zillow server-renders the listing into its Next.js data blob
+NEXT_DATA_RE = re.compile(rb'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+
+@lru_cache(maxsize=None)
+def _chromedriver_path():
+    """Resolve the chromedriver binary once per process instead of on every driver start"""
+    return ChromeDriverManager().install()
+
+def _first_token(text):
+    tokens = text.split(None, 1)
+    return tokens[0] if tokens else ''
+
+def _safe_int(token, default=0):
+    """Parse a scraped count like '1,800', falling back to default"""
+    try:
+        return int(token.replace(',', ''))
+    except ValueError:
+        return default
+
+def _safe_float(token, default=0):
+    """Parse a scraped number like '500,000.00', falling back to default"""
+    try:
+        value = float(token.replace(',', ''))
+    except ValueError:
+        return default
+    # float() also accepts 'nan' and 'inf', which are never real listing values
+    return value if math.isfinite(value) else default
+
 class ZillowScraper:
+    # Idle headless Chromes reused across scrapes; starting Chrome dominates a single page load.
+    # A WebDriver must not be used by two threads at once, so each scrape checks one out.
+    _idle_drivers = queue.LifoQueue()
+    
     def __init__(self, url):
         self.url = url
-        self.ua = UserAgent()
+        self.ua = USER_AGENT
         self.driver = None
         
+    @classmethod
+    def checkout_driver(cls):
+        """Take an idle WebDriver from the pool, starting Chrome if none is free"""
+        try:
+            return cls._idle_drivers.get_nowait()
+        except queue.Empty:
+            return cls(None).initialize_driver()
+            
+    @classmethod
+    def checkin_driver(cls, driver):
+        """Return a healthy WebDriver to the pool for the next scrape"""
+        cls._idle_drivers.put(driver)
+        
+    @classmethod
+    def close_drivers(cls):
+        """Shut down every pooled WebDriver"""
+        while True:
+            try:
+                driver = cls._idle_drivers.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+                
+    @classmethod
+    def scrape_urls(cls, urls, max_workers: int = 4):
+        """Scrape several listings in parallel, one browser per worker"""
+        if not urls:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(urls))) as executor:
+            return list(executor.map(lambda url: cls(url).scrape(), urls))
+        
     def initialize_driver(self):
         """Initialize Chrome WebDriver with options"""
         options = webdriver.ChromeOptions()
         options.add_argument(f'user-agent={self.ua.random}')
         options.add_argument("--headless=new")
         options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-gpu")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2
+        })
         options.add_experimental_option("excludeSwitches", ["enable-automation"])
         options.add_experimental_option('useAutomationExtension', False)
         
         self.driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
+            service=Service(_chromedriver_path()),
             options=options
         )
         self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_RESOURCES})
+        return self.driver
+
+    def _try_static(self):
+        """Read the listing from the server-rendered page without starting a browser"""
+        try:
+            response = SESSION.get(self.url, headers={'User-Agent': self.ua.random}, timeout=10)
+            if response.status_code != 200 or CAPTCHA_RE.search(response.content):
+                return None
+            match = NEXT_DATA_RE.search(response.content)
+            if not match:
+                return None
+                
+            page_props = json.loads(match.group(1)).get('props', {}).get('pageProps', {})
+            cache = page_props.get('componentProps', {}).get('gdpClientCache') or page_props.get('gdpClientCache')
+            if isinstance(cache, str):
+                cache = json.loads(cache)
+            listing = next(
+                (entry['property'] for entry in (cache or {}).values()
+                 if isinstance(entry, dict) and isinstance(entry.get('property'), dict)),
+                None
+            )
+            if not listing or not listing.get('streetAddress'):
+                return None
+                
+            lot_size = listing.get('lotAreaValue') or 0
+            if lot_size and str(listing.get('lotAreaUnits', '')).lower() != 'acres':
+                lot_size = lot_size / 43560  # Convert to acres
+            return {
+                'address': listing['streetAddress'],
+                'price': listing.get('price') or 0,
+                'bedrooms': listing.get('bedrooms') or 0,
+                'bathrooms': listing.get('bathrooms') or 0,
+                'sqft': listing.get('livingArea') or 0,
+                'lot_size': lot_size,
+                'year_built': listing.get('yearBuilt') or 0
+            }
+        except Exception as e:
+            logger.info(f"Static fetch unavailable for {self.url}, using browser: {str(e)}")
+            return None
 
     def scrape(self):
         """Scrape property data from Zillow URL"""
+        # Most listings are in the initial HTML; the browser is only the fallback
+        data = self._try_static()
+        if data:
+            return data
+            
         try:
-            self.initialize_driver()
+            self.driver = self.checkout_driver()
+            self.driver.delete_all_cookies()
             self.driver.get(self.url)
-            time.sleep(3)  # Wait for page to load
+            # Continue as soon as the listing renders instead of always sleeping
+            try:
+                WebDriverWait(self.driver, 10).until(EC.presence_of_element_located(LISTING_READY))
+            except TimeoutException:
+                logger.warning(f"Listing content did not appear for {self.url}")
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            soup = BeautifulSoup(self.driver.page_source, 'lxml')
+            self.checkin_driver(self.driver)
+            self.driver = None
             
             # Extract property details
             return {
@@ -52,56 +211,53 @@ class ZillowScraper:
             }
         except Exception as e:
             logger.error(f"Error scraping {self.url}: {str(e)}")
+            if self.driver is not None:
+                # A browser that failed mid-scrape is discarded rather than pooled
+                try:
+                    self.driver.quit()
+                except WebDriverException:
+                    pass
+                self.driver = None
             return None
-        finally:
-            if self.driver:
-                self.driver.quit()
     
     def get_address(self, soup):
-        element = soup.select_one('h1[data-testid="address"]')
+        element = ADDRESS_SELECTOR.select_one(soup)
         return element.text.strip() if element else "N/A"
     
     def get_price(self, soup):
-        element = soup.select_one('span[data-testid="price"]')
-        if element:
-            price_text = element.text.strip().replace('$', '').replace(',', '')
-            return float(price_text) if price_text.replace('.', '', 1).isdigit() else 0
-        return 0
+        element = PRICE_SELECTOR.select_one(soup)
+        return _safe_float(element.text.strip().lstrip('$')) if element else 0
     
     def get_bedrooms(self, soup):
-        element = soup.select_one('span[data-testid="bedrooms"]')
-        if element:
-            return int(element.text.split()[0]) if element.text.split()[0].isdigit() else 0
-        return 0
+        element = BEDROOMS_SELECTOR.select_one(soup)
+        return _safe_int(_first_token(element.text)) if element else 0
     
     def get_bathrooms(self, soup):
-        element = soup.select_one('span[data-testid="bathrooms"]')
-        if element:
-            return float(element.text.split()[0]) if element.text.split()[0].replace('.', '', 1).isdigit() else 0
-        return 0
+        element = BATHROOMS_SELECTOR.select_one(soup)
+        return _safe_float(_first_token(element.text)) if element else 0
     
     def get_sqft(self, soup):
-        element = soup.select_one('span[data-testid="floor-space"]')
-        if element:
-            sqft_text = element.text.split()[0].replace(',', '')
-            return int(sqft_text) if sqft_text.isdigit() else 0
-        return 0
+        element = SQFT_SELECTOR.select_one(soup)
+        return _safe_int(_first_token(element.text)) if element else 0
     
     def get_lot_size(self, soup):
-        # Look for lot size in various places
-        text = str(soup)
-        if 'acres' in text:
-            match = re.search(r'(\d+\.?\d*)\s*acres?', text)
-            return float(match.group(1)) if match else 0
-        elif 'sqft' in text:
-            match = re.search(r'(\d+,\d+|\d+)\s*sq\.?\s*ft\.?', text)
-            if match:
-                return float(match.group(1).replace(',', '')) / 43560  # Convert to acres
+        # Search the facts panel's text, or the page text if the panel is missing,
+        # instead of serializing the whole DOM back to markup
+        container = FACTS_SELECTOR.select_one(soup)
+        text = (container or soup).get_text(" ")
+        match = LOT_ACRES_RE.search(text)
+        if match:
+            return float(match.group(1))
+        match = LOT_SQFT_RE.search(text)
+        if match:
+            return float(match.group(1).replace(',', '')) / 43560  # Convert to acres
         return 0
     
     def get_year_built(self, soup):
-        element = soup.find('span', string=re.compile(r'Built'))
+        element = soup.find('span', string=BUILT_RE)
         if element:
-            year_text = re.search(r'\d{4}', element.text)
+            year_text = YEAR_RE.search(element.text)
             return int(year_text.group()) if year_text else 0
-        return 0
\ No newline at end of file
+        return 0
+
+atexit.register(ZillowScraper.close_drivers)
@@ -1,26 +1,44 @@
 # File: verify_template.py
+import sys
 from zipfile import ZipFile
 from pathlib import Path
 from src.config import REPORT_TEMPLATE  # Import from your config
 
-def verify_template():
+MIN_ZIP_SIZE = 22
+
+def verify_template(full=False):
     """Verify the Word template is valid before report generation"""
     print("\n Verifying Template File:")
     print(f"Location: {REPORT_TEMPLATE}")
     
     # Check 1: File existence and size
-    exists = REPORT_TEMPLATE.exists()
-    print(f" Exists: {exists}")
-    if exists:
-        print(f" Size: {REPORT_TEMPLATE.stat().st_size} bytes")
+    try:
+        size = REPORT_TEMPLATE.stat().st_size
+    except OSError:
+        size = None
+    print(f" Exists: {size is not None}")
+    if size is None:
+        return False
+    print(f" Size: {size} bytes")
+    # Anything shorter than an end-of-central-directory record cannot be a ZIP
+    if size < MIN_ZIP_SIZE:
+        print(" Invalid DOCX: file too small to be a ZIP archive")
+        return False
     
     # Check 2: Valid ZIP structure (DOCX requirement)
     try:
         with ZipFile(REPORT_TEMPLATE) as z:
+            names = set(z.namelist())
             required_files = ['word/document.xml', '[Content_Types].xml']
-            missing = [f for f in required_files if f not in z.namelist()]
-            print(f" ZIP Contents: {len(z.namelist())} files")
+            missing = [f for f in required_files if f not in names]
+            print(f" ZIP Contents: {len(names)} files")
             print(f" Required Files: {'All present' if not missing else f'Missing: {missing}'}")
+            # CRC-checking every entry decompresses the whole archive, so only on request
+            if full:
+                bad = z.testzip()
+                if bad:
+                    print(f" Corrupt entry: {bad}")
+                    return False
         print(" Template is valid DOCX (ZIP format)")
         return True
     except Exception as e:
@@ -28,4 +46,4 @@ def verify_template():
         return False
 
 if __name__ == "__main__":
-    verify_template()
\ No newline at end of file
+    verify_template(full='--full' in sys.argv[1:])
\ No newline at end of file